@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_remove_jobapplication_job_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='resume_skills',
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:40
+
+import jobs.resume_storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_profile_resume_skills'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='resume',
+            field=models.FileField(blank=True, null=True, storage=jobs.resume_storage.resume_storage, upload_to='resumes/'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from jobs.resume_storage import resume_storage
+
 
 class Profile(models.Model):
     ROLE_CHOICES = (
@@ -19,7 +21,8 @@ class Profile(models.Model):
     # Job Seeker fields
     skills = models.TextField(blank=True)
     experience = models.CharField(max_length=100, blank=True)
-    resume = models.FileField(upload_to='resumes/', blank=True, null=True)
+    resume = models.FileField(upload_to='resumes/', storage=resume_storage, blank=True, null=True)
+    resume_skills = models.TextField(blank=True)  # Detected in uploaded resumes, see jobs.resume_parsing
 
     # Job Provider fields
     company_name = models.CharField(max_length=200, blank=True)
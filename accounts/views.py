@@ -111,8 +111,9 @@ def unauthorized(request):
 def seeker_dashboard(request):
     """Job Seeker Dashboard"""
     from jobs.models import JobApplication
+    from jobs.recommendations import recommended_jobs
     profile = request.user.profile
-    applications = JobApplication.objects.filter(seeker=profile).order_by('-applied_at')
+    applications = JobApplication.objects.filter(seeker=profile).select_related('job__company').order_by('-applied_at')
     accepted_count = applications.filter(status='accepted').count()
     pending_count = applications.filter(status='pending').count()
     rejected_count = applications.filter(status='rejected').count()
@@ -123,17 +124,24 @@ def seeker_dashboard(request):
         'accepted_count': accepted_count,
         'pending_count': pending_count,
         'rejected_count': rejected_count,
+        'recommendations': recommended_jobs(profile),
     })
 
 
 @provider_required
 def provider_dashboard(request):
     """Job Provider Dashboard"""
-    from jobs.models import Job, JobApplication
+    from jobs.models import Job
     profile = request.user.profile
-    jobs = Job.objects.filter(provider=profile).order_by('-created_at')
-    total_applications = JobApplication.objects.filter(job__provider=profile).count()
-    pending_applications = JobApplication.objects.filter(job__provider=profile, status='pending').count()
+    # Application counts come with the jobs, so this is one query however many jobs there are
+    jobs = list(
+        Job.objects.filter(provider=profile)
+        .select_related('company', 'application_counter')
+        .order_by('-created_at')
+    )
+    counters = [counter for counter in (getattr(job, 'application_counter', None) for job in jobs) if counter]
+    total_applications = sum(counter.total for counter in counters)
+    pending_applications = sum(counter.pending for counter in counters)
     
     return render(request, 'accounts/provider_dashboard.html', {
         'profile': profile,
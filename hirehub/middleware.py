@@ -0,0 +1,123 @@
+"""
+Opt-in per-request SQL profiler and N+1 detector.
+
+Enable with SQL_PROFILER_ENABLED = True. Every response then carries
+X-SQL-Query-Count, X-SQL-Time-Ms and X-SQL-Repeated-Queries headers, a
+report is logged to the 'hirehub.sql' logger, and with DEBUG on, adding
+?sql_profile=1 to a URL returns the report as JSON instead of the page.
+
+Query budgets come from SQL_PROFILER_QUERY_BUDGETS ({url_name: max
+queries}) with SQL_PROFILER_DEFAULT_BUDGET as the fallback. Going over
+budget logs a warning, or raises QueryBudgetExceeded when
+SQL_PROFILER_STRICT is set, which makes a test run fail.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import JsonResponse
+
+
+logger = logging.getLogger('hirehub.sql')
+
+_IN_LIST_RE = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_SPACE_RE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a view runs more queries than its budget"""
+
+
+def fingerprint(sql):
+    """Reduce a statement to its shape so repeated per-row queries group together"""
+    sql = _IN_LIST_RE.sub('(...)', sql)
+    sql = _LITERAL_RE.sub('?', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+class QueryProfile:
+    """Execute wrapper collecting every statement run during a request"""
+
+    def __init__(self):
+        self.queries = []  # (fingerprint, seconds)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((fingerprint(sql), time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_ms(self):
+        return sum(seconds for _, seconds in self.queries) * 1000
+
+    def repeated(self, threshold):
+        """Fingerprints executed at least `threshold` times, most frequent first"""
+        counts = Counter(sql for sql, _ in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count >= threshold]
+
+    def report(self, view_name, budget, threshold):
+        return {
+            'view': view_name,
+            'query_count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'budget': budget,
+            'over_budget': budget is not None and self.count > budget,
+            'repeated_queries': [
+                {'sql': sql, 'count': count} for sql, count in self.repeated(threshold)
+            ],
+        }
+
+
+class SQLProfilerMiddleware:
+    """Record query count, DB time and repeated queries for each view"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQL_PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.budgets = getattr(settings, 'SQL_PROFILER_QUERY_BUDGETS', {})
+        self.default_budget = getattr(settings, 'SQL_PROFILER_DEFAULT_BUDGET', None)
+        self.threshold = getattr(settings, 'SQL_PROFILER_REPEAT_THRESHOLD', 5)
+        self.strict = getattr(settings, 'SQL_PROFILER_STRICT', False)
+
+    def __call__(self, request):
+        profile = QueryProfile()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = (match.view_name if match else None) or request.path
+        budget = self.budgets.get(view_name, self.default_budget)
+        report = profile.report(view_name, budget, self.threshold)
+
+        response['X-SQL-Query-Count'] = str(report['query_count'])
+        response['X-SQL-Time-Ms'] = f"{report['total_ms']:.1f}"
+        response['X-SQL-Repeated-Queries'] = str(len(report['repeated_queries']))
+
+        if report['repeated_queries'] or report['over_budget']:
+            logger.warning('SQL profile for %s: %s', view_name, report)
+        else:
+            logger.debug('SQL profile for %s: %s', view_name, report)
+
+        if report['over_budget'] and self.strict:
+            raise QueryBudgetExceeded(
+                f"{view_name} ran {report['query_count']} queries (budget {budget})"
+            )
+
+        if settings.DEBUG and request.GET.get('sql_profile'):
+            return JsonResponse(report)
+        return response
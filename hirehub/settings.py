@@ -44,6 +44,7 @@ INSTALLED_APPS = [
 # MIDDLEWARE
 # -------------------------------------------------
 MIDDLEWARE = [
+    'hirehub.middleware.SQLProfilerMiddleware',  # No-op unless SQL_PROFILER_ENABLED
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +55,35 @@ MIDDLEWARE = [
 ]
 
 
+# -------------------------------------------------
+# SKILLS
+# -------------------------------------------------
+# Extra alias -> canonical skill names, merged over jobs.skills.DEFAULT_SKILL_ALIASES.
+# Run `python manage.py canonicalize_skills` after changing them.
+SKILL_ALIASES = {}
+
+# How skill match percentages count skills: 'uniform' (every skill alike) or
+# 'idf' (rare skills across listed jobs weigh more, see jobs/skill_weights.py).
+SKILL_MATCH_WEIGHTING = 'uniform'
+
+
+# -------------------------------------------------
+# SQL PROFILING (opt-in, see hirehub/middleware.py)
+# -------------------------------------------------
+SQL_PROFILER_ENABLED = False
+SQL_PROFILER_DEFAULT_BUDGET = None          # Max queries per view, None = unlimited
+SQL_PROFILER_QUERY_BUDGETS = {
+    'job_list': 10,
+    'job_detail': 12,
+    'job_applicants': 10,
+    'provider_dashboard': 5,
+    'seeker_dashboard': 10,
+    'suggested_candidates': 10,
+}
+SQL_PROFILER_REPEAT_THRESHOLD = 5           # Same query this many times = likely N+1
+SQL_PROFILER_STRICT = False                 # Raise when over budget (enable in tests)
+
+
 # -------------------------------------------------
 # URL CONFIG
 # -------------------------------------------------
@@ -98,6 +128,24 @@ DATABASES = {
 }
 
 
+# -------------------------------------------------
+# CACHE
+# -------------------------------------------------
+# The in-memory skill, location and typeahead indexes, the facet,
+# recommendation and skill weight caches all coordinate processes through
+# version counters kept here, so every worker process must share this
+# cache. Local memory only suits a single process (runserver); with more
+# than one worker use a shared server, e.g.
+#     'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#     'LOCATION': 'redis://127.0.0.1:6379',
+# `manage.py check --deploy` warns when the cache is per-process.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
 # -------------------------------------------------
 # PASSWORD VALIDATION
 # -------------------------------------------------
@@ -147,6 +195,25 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    # Resumes are stored once per distinct file, see jobs/resume_storage.py
+    'resumes': {
+        'BACKEND': 'jobs.resume_storage.ContentAddressedStorage',
+    },
+}
+
+# Resume downloads are checked by Django and sent by the web server when set:
+# 'x-accel-redirect' (nginx, internal location RESUME_ACCEL_PREFIX -> MEDIA_ROOT),
+# 'x-sendfile' (Apache / lighttpd), or None to stream from Django
+RESUME_SENDFILE = None
+RESUME_ACCEL_PREFIX = '/protected-media/'
+
 
 
 # -------------------------------------------------
@@ -1,7 +1,11 @@
+import posixpath
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from django.http import Http404
+from django.views.static import serve
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,9 +14,17 @@ urlpatterns = [
     path('', include('mentors.urls')),
 ]
 
-# Serve media files in development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Serve media files in development, except resumes: those only go out
+# through the access-checked jobs.views.download_resume
+def serve_public_media(request, path):
+    # Checked after normalizing, as serve() does: //resumes/ and x/../resumes/ are resumes too
+    path = posixpath.normpath(path).lstrip('/')
+    if path == 'resumes' or path.startswith('resumes/'):
+        raise Http404('Not found')
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
 
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.DEBUG:
+    urlpatterns += [
+        re_path(rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?P<path>.*)$', serve_public_media),
+    ]
@@ -1,7 +1,14 @@
 from django.contrib import admin
 from django.utils import timezone
-from django.utils.html import format_html
-from .models import Company, Job, JobApplication, JobReport
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+from . import facets, skill_weights
+from .duplicates import duplicates_of
+from .locations import get_location_directory
+from .models import ApplicationStatusChange, Company, Job, JobApplication, JobReport, JobSkill, Location, LocationAlias, ResumeParse, Skill
+from .skill_index import get_skill_index
+from .typeahead import get_typeahead_index
 
 
 # -----------------------
@@ -37,7 +44,7 @@ class JobAdmin(admin.ModelAdmin):
     list_editable = ('is_active',)
     ordering = ('-created_at',)
     date_hierarchy = 'created_at'
-    readonly_fields = ('created_at', 'updated_at', 'verified_at')
+    readonly_fields = ('created_at', 'updated_at', 'verified_at', 'near_duplicates')
     actions = ['verify_jobs', 'unverify_jobs']
 
     fieldsets = (
@@ -50,6 +57,9 @@ class JobAdmin(admin.ModelAdmin):
         ('Status', {
             'fields': ('is_active', 'is_verified', 'verified_at')
         }),
+        ('Near-duplicates', {
+            'fields': ('near_duplicates',)
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -62,6 +72,22 @@ class JobAdmin(admin.ModelAdmin):
         return format_html('<span style="color: orange;">⏳ Pending</span>')
     verification_status.short_description = 'Verification'
 
+    def near_duplicates(self, obj):
+        if obj is None or obj.pk is None:
+            return '-'
+        found = duplicates_of(obj)
+        if not found:
+            return 'None found'
+        return format_html_join(
+            mark_safe('<br>'),
+            '<a href="{}">{}</a> at {} ({}% similar)',
+            (
+                (reverse('admin:jobs_job_change', args=[job.pk]), job.title, job.company.name, score)
+                for job, score in found
+            ),
+        )
+    near_duplicates.short_description = 'Postings by the same provider or company'
+
     def report_count(self, obj):
         count = obj.reports.filter(status='pending').count()
         if count > 0:
@@ -69,14 +95,27 @@ class JobAdmin(admin.ModelAdmin):
         return '0'
     report_count.short_description = 'Reports'
 
+    def _set_verified(self, queryset, **changes):
+        # Take the ids first: a changelist filter such as is_verified__exact=0
+        # no longer matches the jobs once they are updated
+        ids = list(queryset.values_list('pk', flat=True))
+        jobs = Job.objects.filter(pk__in=ids)
+        jobs.update(**changes)
+        skill_weights.recount(Skill.objects.filter(pk__in=JobSkill.objects.filter(job_id__in=ids).values('skill_id')))
+        get_skill_index().refresh_jobs(ids)
+        get_location_directory().refresh_locations(jobs.values_list('canonical_location_id', flat=True))
+        get_typeahead_index().refresh_jobs(jobs)
+        facets.invalidate()
+        return len(ids)
+
     def verify_jobs(self, request, queryset):
-        queryset.update(is_verified=True, verified_at=timezone.now())
-        self.message_user(request, f'{queryset.count()} jobs verified.')
+        count = self._set_verified(queryset, is_verified=True, verified_at=timezone.now())
+        self.message_user(request, f'{count} jobs verified.')
     verify_jobs.short_description = "Verify selected jobs"
 
     def unverify_jobs(self, request, queryset):
-        queryset.update(is_verified=False, verified_at=None)
-        self.message_user(request, f'{queryset.count()} jobs unverified.')
+        count = self._set_verified(queryset, is_verified=False, verified_at=None)
+        self.message_user(request, f'{count} jobs unverified.')
     unverify_jobs.short_description = "Unverify selected jobs"
 
 
@@ -104,6 +143,25 @@ class JobApplicationAdmin(admin.ModelAdmin):
     skill_match_display.short_description = 'Skill Match'
 
 
+@admin.register(ApplicationStatusChange)
+class ApplicationStatusChangeAdmin(admin.ModelAdmin):
+    list_display = ('application', 'from_status', 'to_status', 'changed_by', 'changed_at')
+    list_filter = ('to_status', 'changed_at')
+    search_fields = ('application__job__title', 'application__seeker__user__username', 'changed_by__user__username')
+    date_hierarchy = 'changed_at'
+    list_select_related = ('application__job', 'application__seeker__user', 'changed_by__user')
+
+    # The audit trail is append-only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 # -----------------------
 # Job Report Admin
 # -----------------------
@@ -141,4 +199,47 @@ class JobReportAdmin(admin.ModelAdmin):
     def mark_dismissed(self, request, queryset):
         queryset.update(status='dismissed', resolved_at=timezone.now())
         self.message_user(request, f'{queryset.count()} reports dismissed.')
-    mark_dismissed.short_description = "Dismiss Reports"
\ No newline at end of file
+    mark_dismissed.short_description = "Dismiss Reports"
+
+
+# -----------------------
+# Skill Admin
+# -----------------------
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name',)
+    search_fields = ('name',)
+    ordering = ('name',)
+
+
+# -----------------------
+# Resume Parse Admin
+# -----------------------
+@admin.register(ResumeParse)
+class ResumeParseAdmin(admin.ModelAdmin):
+    list_display = ('file', 'profile', 'status', 'created_at', 'parsed_at')
+    list_filter = ('status',)
+    search_fields = ('file', 'profile__user__username', 'skills')
+    readonly_fields = ('profile', 'file', 'skills', 'error', 'created_at', 'parsed_at')
+    actions = ['requeue']
+
+    def requeue(self, request, queryset):
+        queryset.update(status='pending', error='')
+        self.message_user(request, f'{queryset.count()} resumes queued for parsing.')
+    requeue.short_description = "Parse again"
+
+
+# -----------------------
+# Location Admin
+# -----------------------
+class LocationAliasInline(admin.TabularInline):
+    model = LocationAlias
+    extra = 1
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'key')
+    search_fields = ('name', 'key', 'aliases__key')
+    ordering = ('name',)
+    inlines = [LocationAliasInline]
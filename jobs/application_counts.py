@@ -0,0 +1,96 @@
+"""
+Per-job application counters for provider dashboards.
+
+JobApplicationCounter holds each job's total and per-status application
+counts, so provider_dashboard reads them with the jobs themselves instead
+of counting applications. They are kept in step in the same transaction
+as the change that moves them: JobApplication save/delete (signals in
+jobs/signals.py) and bulk status changes (jobs/status_changes.py) apply
+F() deltas. The reconcile_application_counts command recounts from the
+applications and fixes any drift.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+from .models import Job, JobApplication, JobApplicationCounter
+
+
+# One counter field per status
+STATUSES = [status for status, _ in JobApplication.STATUS_CHOICES]
+
+
+def adjust(job_id, total=0, statuses=None):
+    """Add `total` and {status: delta} to a job's counters"""
+    # Clamped, so drift cannot fail the user's change; reconcile() repairs it
+    changes = {status: Greatest(F(status) + delta, 0) for status, delta in (statuses or {}).items() if delta}
+    if total:
+        changes['total'] = Greatest(F('total') + total, 0)
+    if not changes:
+        return
+    if not JobApplicationCounter.objects.filter(job_id=job_id).update(**changes) and total > 0:
+        # No counter row yet; the application being added is already saved
+        reconcile([job_id])
+
+
+def application_saved(application, previous):
+    """Count a saved application; `previous` is its stored job_id and status, None when new"""
+    if previous is None:
+        adjust(application.job_id, total=1, statuses={application.status: 1})
+    elif previous['job_id'] != application.job_id:
+        adjust(previous['job_id'], total=-1, statuses={previous['status']: -1})
+        adjust(application.job_id, total=1, statuses={application.status: 1})
+    elif previous['status'] != application.status:
+        adjust(application.job_id, statuses={previous['status']: -1, application.status: 1})
+
+
+def application_deleted(application):
+    adjust(application.job_id, total=-1, statuses={application.status: -1})
+
+
+def statuses_changed(job_id, previous_statuses, status):
+    """Move the applications counted in `previous_statuses` ({status: count}) to `status`"""
+    deltas = Counter({status: sum(previous_statuses.values())})
+    deltas.subtract(previous_statuses)
+    adjust(job_id, statuses=deltas)
+
+
+def reconcile(job_ids=None):
+    """
+    Recount the counters of `job_ids` (every job by default) from the
+    applications. Returns the number of counters that were missing or wrong.
+    """
+    applications = JobApplication.objects.all()
+    jobs = Job.objects.all()
+    counters = JobApplicationCounter.objects.all()
+    if job_ids is not None:
+        applications = applications.filter(job_id__in=job_ids)
+        jobs = jobs.filter(pk__in=job_ids)
+        counters = counters.filter(job_id__in=job_ids)
+
+    fields = ['total'] + STATUSES
+    actual = {
+        row.pop('job_id'): row
+        for row in applications.values('job_id').order_by().annotate(
+            total=Count('pk'), **{status: Count('pk', filter=Q(status=status)) for status in STATUSES}
+        )
+    }
+    empty = dict.fromkeys(fields, 0)
+
+    fixed = 0
+    with transaction.atomic():
+        stored = {row.pop('job_id'): row for row in counters.values('job_id', *fields)}
+        missing = [job_id for job_id in jobs.values_list('pk', flat=True).iterator() if job_id not in stored]
+        JobApplicationCounter.objects.bulk_create(
+            [JobApplicationCounter(job_id=job_id, **actual.get(job_id, empty)) for job_id in missing],
+            batch_size=500,
+        )
+        fixed += len(missing)
+        for job_id, row in stored.items():
+            expected = actual.get(job_id, empty)
+            if row != expected:
+                JobApplicationCounter.objects.filter(job_id=job_id).update(**expected)
+                fixed += 1
+    return fixed
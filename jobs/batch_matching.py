@@ -0,0 +1,164 @@
+"""
+Vectorized skill matching for many seekers against many jobs.
+
+Skill sets are packed into bit matrices over a shared vocabulary (one
+uint64 word per 64 skills, most common skills in the first words), so the
+number of skills a seeker shares with a job is the popcount of the AND of
+their rows. Seekers are processed in blocks to keep the intermediate
+arrays small, and words that no seeker of a block uses are skipped.
+
+Scores are exactly those of Job.calculate_skill_match(): a lookup table
+filled with round(matched / required * 100) maps every (matched, required)
+pair, with a float path using np.rint (the same ties-to-even rounding) for
+jobs listing more than 255 skills, and 0 when either side has no skills.
+
+Meant for bulk work such as recommendation mailings and re-scoring stored
+applications; request-time lookups should use match_store or the skill
+index instead.
+"""
+from collections import Counter
+
+import numpy as np
+
+
+SEEKER_BLOCK_SIZE = 16
+MAX_LOOKUP_SKILLS = 255
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(words, out=None):
+        return np.bitwise_count(words, out=out)
+else:  # NumPy < 2.0
+    _BYTE_COUNTS = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+    def _popcount(words, out=None):
+        counts = _BYTE_COUNTS[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1, dtype=np.uint8)
+        if out is None:
+            return counts
+        out[...] = counts
+        return out
+
+
+def _vocabulary(job_skills):
+    # Most frequent first, so dense bits share the leading words
+    counts = Counter(name for names in job_skills for name in names)
+    return {name: column for column, (name, _) in enumerate(counts.most_common())}
+
+
+def _pack(skill_sets, vocabulary):
+    """Bit-pack skill sets into a (len(skill_sets), words) uint64 matrix"""
+    width = max(1, -(-len(vocabulary) // 64))
+    bits = np.zeros((len(skill_sets), width * 64), dtype=bool)
+    for row, names in enumerate(skill_sets):
+        columns = [vocabulary[name] for name in names if name in vocabulary]
+        bits[row, columns] = True
+    # Bit i of word w holds column 64 * w + i
+    return np.packbits(bits, axis=1, bitorder='little').view('<u8').astype(np.uint64, copy=False)
+
+
+def _totals(job_skills):
+    return np.array([len(names) for names in job_skills], dtype=np.float64)
+
+
+def _scores(counts, totals):
+    percentages = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+    return np.rint(percentages * 100).astype(np.uint8)
+
+
+def _score_lookup(max_total):
+    """Scores indexed by (matched << 8) | required, computed by the scalar formula"""
+    lookup = np.zeros(256 * (max_total + 1), dtype=np.uint8)
+    for required in range(1, max_total + 1):
+        for matched in range(required + 1):
+            lookup[(matched << 8) | required] = round(matched / required * 100)
+    return lookup
+
+
+class SkillMatcher:
+    """Precomputed bit matrix of job skills, scored against blocks of seekers"""
+
+    def __init__(self, job_skills):
+        job_skills = [frozenset(names) for names in job_skills]
+        self.vocabulary = _vocabulary(job_skills)
+        self.jobs = _pack(job_skills, self.vocabulary)
+        self.totals = _totals(job_skills)
+        # Table lookups are several times cheaper than float division over
+        # the whole block; jobs listing more skills than a byte holds are rare
+        max_total = int(self.totals.max()) if len(job_skills) else 0
+        self._lookup = _score_lookup(max_total) if max_total <= MAX_LOOKUP_SKILLS else None
+        self._required = self.totals.astype(np.uint16)
+
+    def __len__(self):
+        return len(self.totals)
+
+    def pack_seekers(self, seeker_skills):
+        return _pack(list(seeker_skills), self.vocabulary)
+
+    def _match_counts(self, seekers):
+        counts = np.zeros((len(seekers), len(self)), dtype=np.uint16)
+        scratch = np.empty(counts.shape, dtype=np.uint64)
+        word_counts = np.empty(counts.shape, dtype=np.uint8)
+        for word in np.flatnonzero(seekers.any(axis=0)):
+            np.bitwise_and(seekers[:, word, None], self.jobs[None, :, word], out=scratch)
+            counts += _popcount(scratch, out=word_counts)
+        return counts
+
+    def _score_counts(self, counts, required, totals):
+        if self._lookup is None:
+            return _scores(counts, totals)
+        counts <<= 8
+        counts |= required
+        return np.take(self._lookup, counts)
+
+    def iter_blocks(self, seeker_skills, block_size=SEEKER_BLOCK_SIZE):
+        """Yield (first seeker row, uint8 score block) for successive seeker blocks"""
+        seekers = self.pack_seekers(seeker_skills)
+        for start in range(0, len(seekers), block_size):
+            counts = self._match_counts(seekers[start:start + block_size])
+            yield start, self._score_counts(counts, self._required, self.totals)
+
+    def score_matrix(self, seeker_skills, block_size=SEEKER_BLOCK_SIZE):
+        """Full (seekers x jobs) uint8 matrix of match percentages"""
+        seeker_skills = list(seeker_skills)
+        matrix = np.empty((len(seeker_skills), len(self)), dtype=np.uint8)
+        for start, block in self.iter_blocks(seeker_skills, block_size):
+            matrix[start:start + len(block)] = block
+        return matrix
+
+    def score_pairs(self, seeker_skills, job_rows):
+        """
+        Scores of seeker_skills[i] against job row job_rows[i], for scattered
+        pairs such as stored applications.
+        """
+        seekers = self.pack_seekers(seeker_skills)
+        job_rows = np.asarray(job_rows, dtype=np.intp)
+        counts = _popcount(seekers & self.jobs[job_rows]).sum(axis=1, dtype=np.uint16)
+        return self._score_counts(counts, self._required[job_rows], self.totals[job_rows])
+
+
+def score_matrix(seeker_skills, job_skills, block_size=SEEKER_BLOCK_SIZE):
+    """Match percentages of every seeker against every job as an N x M uint8 array"""
+    return SkillMatcher(job_skills).score_matrix(seeker_skills, block_size)
+
+
+def skill_sets(link_rows):
+    """Group (owner id, skill name) rows into {owner id: frozenset of names}"""
+    grouped = {}
+    for owner_id, name in link_rows:
+        grouped.setdefault(owner_id, set()).add(name)
+    return {owner_id: frozenset(names) for owner_id, names in grouped.items()}
+
+
+def load_job_skills(jobs):
+    """{job id: frozenset of skill names} for a Job queryset; jobs without skills are absent"""
+    from .models import JobSkill
+
+    rows = JobSkill.objects.filter(job__in=jobs).values_list('job_id', 'skill__name')
+    return skill_sets(rows.iterator())
+
+
+def load_seeker_skills(profiles):
+    """{profile id: frozenset of skill names} for a Profile queryset; profiles without skills are absent"""
+    from .models import ProfileSkill
+
+    rows = ProfileSkill.objects.filter(profile__in=profiles).values_list('profile_id', 'skill__name')
+    return skill_sets(rows.iterator())
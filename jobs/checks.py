@@ -0,0 +1,29 @@
+"""
+System checks for the jobs app.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """The in-memory indexes and cached job data are kept in step through the default cache"""
+    if settings.CACHES['default']['BACKEND'] not in PER_PROCESS_CACHES:
+        return []
+    return [
+        Warning(
+            'The default cache is not shared between processes.',
+            hint=(
+                'Skill, location and typeahead indexes and cached facets only learn about job '
+                'changes made by other worker processes through the default cache; configure '
+                'a shared backend such as Redis or Memcached in CACHES.'
+            ),
+            id='jobs.W001',
+        )
+    ]
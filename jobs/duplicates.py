@@ -0,0 +1,147 @@
+"""
+Near-duplicate job postings.
+
+A posting's tokens are the overlapping SHINGLE_SIZE-word shingles of its
+title and description, so two postings collide when most of their text
+is the same, whatever the skills list says. Their MinHash signatures are
+stored with kind 'duplicate' in the LSH index (jobs/lsh.py) and kept up
+to date from a Job post_save signal, so checking a posting only compares
+it with the postings sharing a bucket.
+
+create_job asks for confirmation when a new posting nearly repeats one
+of the provider's or company's existing postings, the admin lists the
+near-duplicates of a job and the find_duplicate_jobs command groups them
+across the whole catalogue.
+"""
+import re
+
+import numpy as np
+from django.db.models import Q
+
+from .lsh import LSHIndex, NUM_PERM, signature
+from .models import Job, JobSignature, JobSignatureBucket
+
+
+DUPLICATE_KIND = 'duplicate'
+SHINGLE_SIZE = 3
+DUPLICATE_THRESHOLD = 0.7
+
+_WORD = re.compile(r'[a-z0-9+#]+')
+
+index = LSHIndex(DUPLICATE_KIND)
+
+
+def shingles(title, description):
+    words = _WORD.findall(f'{title} {description}'.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[start:start + SHINGLE_SIZE]) for start in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def update_job(job):
+    index.update(job.pk, shingles(job.title, job.description))
+
+
+def rebuild_all():
+    """Recompute every near-duplicate signature"""
+    jobs = Job.objects.only('id', 'title', 'description').order_by('pk')
+    return index.rebuild((job.pk, shingles(job.title, job.description)) for job in jobs.iterator())
+
+
+def find_duplicates(title, description, provider_id, company_id, exclude=()):
+    """
+    [(job, similarity percentage)] of the provider's or company's postings
+    whose text nearly repeats `title` and `description`, closest first.
+    """
+    values = signature(shingles(title, description))
+    if values is None:
+        return []
+    top = index.query(
+        values,
+        Q(job__provider_id=provider_id) | Q(job__company_id=company_id),
+        exclude=exclude,
+        threshold=DUPLICATE_THRESHOLD,
+    )
+    jobs = Job.objects.select_related('company').in_bulk([job_id for job_id, _ in top])
+    return [(jobs[job_id], round(score * 100)) for job_id, score in top if job_id in jobs]
+
+
+def duplicates_of(job):
+    return find_duplicates(job.title, job.description, job.provider_id, job.company_id, exclude={job.pk})
+
+
+class _DisjointSet:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        parent = self.parent.setdefault(item, item)
+        while parent != item:
+            grandparent = self.parent[parent]
+            self.parent[item] = grandparent
+            item, parent = parent, grandparent
+        return item
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+def group_duplicates(threshold=DUPLICATE_THRESHOLD):
+    """
+    Group the whole catalogue into sets of near-duplicate job ids.
+
+    Bucket rows are streamed in key order, so only jobs sharing a bucket
+    are compared and every pair is scored once; pairs at or above the
+    threshold are merged with union-find. Signatures are held in memory
+    (NUM_PERM * 8 bytes per job). Returns groups of two or more ids,
+    largest first.
+    """
+    signatures = JobSignature.objects.filter(kind=DUPLICATE_KIND)
+    job_ids = []
+    data = []
+    for job_id, packed in signatures.values_list('job_id', 'signature').iterator():
+        job_ids.append(job_id)
+        data.append(bytes(packed))
+    if not job_ids:
+        return []
+    matrix = np.frombuffer(b''.join(data), dtype='<u8').reshape(len(job_ids), NUM_PERM)
+    rows = {job_id: row for row, job_id in enumerate(job_ids)}
+
+    groups = _DisjointSet()
+    compared = set()
+
+    def compare(members):
+        for position, job_id in enumerate(members[:-1]):
+            others = [other for other in members[position + 1:] if (job_id, other) not in compared]
+            if not others:
+                continue
+            compared.update((job_id, other) for other in others)
+            scores = (matrix[[rows[other] for other in others]] == matrix[rows[job_id]]).mean(axis=1)
+            for other, score in zip(others, scores):
+                if score >= threshold:
+                    groups.union(job_id, other)
+
+    buckets = (
+        JobSignatureBucket.objects
+        .filter(signature__kind=DUPLICATE_KIND)
+        .order_by('key', 'signature__job_id')
+        .values_list('key', 'signature__job_id')
+    )
+    current_key = None
+    members = []
+    for key, job_id in buckets.iterator():
+        if key != current_key:
+            if len(members) > 1:
+                compare(members)
+            current_key = key
+            members = []
+        members.append(job_id)
+    if len(members) > 1:
+        compare(members)
+
+    grouped = {}
+    for job_id in list(groups.parent):
+        grouped.setdefault(groups.find(job_id), []).append(job_id)
+    return sorted((sorted(ids) for ids in grouped.values() if len(ids) > 1), key=lambda ids: (-len(ids), ids[0]))
@@ -0,0 +1,126 @@
+"""
+Filter facets for the job list sidebar.
+
+Counts per company, job type and location are computed for the current
+filter set, each dimension ignoring its own filter so users can see what
+switching it would give. Results are cached under a version number that
+Job, Company and Location signals bump (see jobs/signals.py), so repeated
+requests, anonymous ones included, skip the GROUP BY queries entirely.
+Other processes only see the bump through a shared cache (see CACHES in
+settings); with a per-process one they serve counts up to
+FACET_CACHE_TIMEOUT old.
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from . import search
+from .locations import get_location_directory
+from .models import Job, JobSkill
+from .skills import canonical_skill
+
+
+FACET_DIMENSIONS = ('company', 'job_type', 'location', 'skill', 'search')
+FACET_CACHE_TIMEOUT = 60 * 10
+VERSION_CACHE_KEY = 'jobs:facets:version'
+
+
+def listed_jobs():
+    """Jobs visible on the public job list"""
+    return Job.objects.filter(is_verified=True, is_active=True)
+
+
+def apply_filters(queryset, filters, exclude=None):
+    """Apply job list filters, skipping the dimension named by `exclude`"""
+    def active(name):
+        return name != exclude and filters.get(name)
+
+    if active('company'):
+        queryset = queryset.filter(company_id=filters['company'])
+    if active('job_type'):
+        queryset = queryset.filter(job_type=filters['job_type'])
+    if active('location'):
+        location_id = get_location_directory().lookup(filters['location'])
+        if location_id is not None:
+            queryset = queryset.filter(canonical_location_id=location_id)
+        else:
+            # Text that is not a known location or alias: fall back to a scan
+            queryset = queryset.filter(location__icontains=filters['location'])
+    if active('skill'):
+        # Subquery rather than a join so aggregate annotations stay unaffected
+        skill = canonical_skill(filters['skill'])
+        queryset = queryset.filter(id__in=JobSkill.objects.filter(skill__name=skill).values('job_id'))
+    if active('search'):
+        queryset = search.filter_jobs(queryset, filters['search'])
+    return queryset
+
+
+def _compute(filters):
+    companies = (
+        apply_filters(listed_jobs(), filters, exclude='company')
+        .values('company_id', 'company__name')
+        .annotate(count=Count('id'))
+        .order_by('company__name')
+    )
+    job_type_counts = dict(
+        apply_filters(listed_jobs(), filters, exclude='job_type')
+        .values_list('job_type')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    locations = (
+        apply_filters(listed_jobs(), filters, exclude='location')
+        .filter(canonical_location__isnull=False)
+        .values('canonical_location_id', 'canonical_location__name')
+        .annotate(count=Count('id'))
+        .order_by('canonical_location__name')
+    )
+    return {
+        'companies': [
+            {'id': row['company_id'], 'name': row['company__name'], 'count': row['count']}
+            for row in companies
+        ],
+        'job_types': [
+            {'code': code, 'name': name, 'count': job_type_counts.get(code, 0)}
+            for code, name in Job.JOB_TYPE_CHOICES
+        ],
+        'locations': [
+            {'id': row['canonical_location_id'], 'name': row['canonical_location__name'], 'count': row['count']}
+            for row in locations
+        ],
+    }
+
+
+def _cache_key(filters):
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, 1, timeout=None)
+        version = cache.get(VERSION_CACHE_KEY)
+    normalized = {name: filters.get(name) or '' for name in FACET_DIMENSIONS}
+    normalized['skill'] = canonical_skill(normalized['skill'])
+    digest = hashlib.sha1(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+    return f'jobs:facets:{version}:{digest}'
+
+
+def job_facets(filters):
+    """
+    Return cached facet counts for a dict of job list filters.
+
+    {'companies': [{'id', 'name', 'count'}], 'job_types': [{'code', 'name',
+    'count'}], 'locations': [{'id', 'name', 'count'}]}. Only values with at least
+    one active, verified job are listed, except job types which are fixed.
+    """
+    key = _cache_key(filters)
+    facets = cache.get(key)
+    if facets is None:
+        facets = _compute(filters)
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate():
+    """Make every cached facet stale; called when jobs or companies change"""
+    cache.add(VERSION_CACHE_KEY, 1, timeout=None)
+    cache.incr(VERSION_CACHE_KEY)
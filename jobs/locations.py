@@ -0,0 +1,190 @@
+"""
+Canonical job locations.
+
+Job.location stays free text as typed by providers, but on every save it
+is resolved to a canonical Location row (see jobs/signals.py): the text is
+normalized ("  bangalore. " -> "bangalore"), looked up among the
+LocationAlias keys ("bengaluru" -> Bangalore) and the Location keys, and a
+new Location is created only when neither matches. Filtering the job list
+by location is then an indexed equality on Job.canonical_location.
+
+LocationDirectory keeps every location key in memory for filter lookups,
+plus a prefix trie over names and aliases weighted by listed-job count
+that backs the location autocomplete endpoint. Like the skill index it
+loads lazily, is updated incrementally from signals and reloads when the
+version counter in the shared cache shows another process changed it, or
+once it is older than INDEX_MAX_AGE.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .skill_index import INDEX_MAX_AGE
+from .trie import PrefixTrie
+
+
+VERSION_CACHE_KEY = 'jobs:locations:version'
+AUTOCOMPLETE_LIMIT = 10
+
+_STRIP_CHARS = ' .,;:-'
+
+
+def clean_location_name(text):
+    """Collapse whitespace and trailing punctuation for display"""
+    name = ' '.join((text or '').split()).strip(_STRIP_CHARS)
+    return name.title() if name.islower() else name
+
+
+def normalize_location_key(text):
+    """Lookup key for a location or alias: cleaned and lowercased"""
+    return clean_location_name(text).lower()
+
+
+def resolve_location(text, create=True):
+    """
+    Return the canonical Location for free-text `text`.
+
+    Aliases win over location keys. With create=False, None is returned
+    when nothing matches; empty text always resolves to None.
+    """
+    from .models import Location, LocationAlias
+
+    key = normalize_location_key(text)
+    if not key:
+        return None
+    alias = LocationAlias.objects.select_related('location').filter(key=key).first()
+    if alias is not None:
+        return alias.location
+    if not create:
+        return Location.objects.filter(key=key).first()
+    location, _ = Location.objects.get_or_create(key=key, defaults={'name': clean_location_name(text)})
+    return location
+
+
+class LocationDirectory:
+    """In-memory key -> location lookup and weighted prefix autocomplete"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._version = None
+        self._loaded_at = 0.0
+        self._clear()
+
+    def _clear(self):
+        self._trie = PrefixTrie(limit=AUTOCOMPLETE_LIMIT)
+        self._id_by_key = {}        # name or alias key -> location id
+        self._keys_of = {}          # location id -> its keys
+        self._names = {}            # location id -> display name
+        self._counts = {}           # location id -> listed jobs, when > 0
+
+    def load(self):
+        """Read every location, alias and listed-job count from the database"""
+        with self._lock:
+            cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+            self._version = cache.get(VERSION_CACHE_KEY)
+            self._clear()
+            self._read(None)
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+
+    def _stale(self, version):
+        return not self._loaded or version != self._version or time.monotonic() - self._loaded_at > INDEX_MAX_AGE
+
+    def _ensure_loaded(self):
+        version = cache.get(VERSION_CACHE_KEY)
+        if self._stale(version):
+            with self._lock:
+                if self._stale(version):
+                    self.load()
+
+    def _read(self, location_ids):
+        from .models import Location, LocationAlias
+
+        locations = Location.objects.annotate(
+            listed=Count('jobs', filter=Q(jobs__is_active=True, jobs__is_verified=True))
+        )
+        aliases = LocationAlias.objects.values_list('location_id', 'key')
+        if location_ids is not None:
+            locations = locations.filter(pk__in=location_ids)
+            aliases = aliases.filter(location_id__in=location_ids)
+
+        keys = {}
+        for location_id, key in aliases:
+            keys.setdefault(location_id, []).append(key)
+        for location in locations.values_list('id', 'key', 'name', 'listed'):
+            location_id, key, name, listed = location
+            self._set(location_id, name, [key] + keys.get(location_id, []), listed)
+
+    def _drop(self, location_id):
+        count = self._counts.pop(location_id, None)
+        for key in self._keys_of.pop(location_id, ()):
+            if self._id_by_key.get(key) == location_id:
+                del self._id_by_key[key]
+            if count:
+                self._trie.discard(key, location_id)
+        self._names.pop(location_id, None)
+
+    def _set(self, location_id, name, keys, listed):
+        self._drop(location_id)
+        self._names[location_id] = name
+        self._keys_of[location_id] = keys
+        for key in keys:
+            self._id_by_key[key] = location_id
+        # Only locations with listed jobs are worth suggesting
+        if listed:
+            self._counts[location_id] = listed
+            for key in keys:
+                self._trie.add(key, location_id, weight=listed)
+
+    def refresh_locations(self, location_ids):
+        """Re-read the given locations after their jobs, names or aliases changed"""
+        location_ids = {location_id for location_id in location_ids if location_id is not None}
+        if not location_ids:
+            return
+
+        def change():
+            for location_id in location_ids:
+                self._drop(location_id)
+            self._read(location_ids)
+
+        with self._lock:
+            version = _bump_version()
+            if self._loaded:
+                change()
+                # Same protocol as the skill index: keep our copy only if no
+                # other process changed locations since we last synced.
+                if self._version is not None and version == self._version + 1:
+                    self._version = version
+
+    def lookup(self, text):
+        """Location id for free text via name or alias keys, without querying"""
+        self._ensure_loaded()
+        return self._id_by_key.get(normalize_location_key(text))
+
+    def complete(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        """Locations with listed jobs whose name or an alias starts with `prefix`"""
+        key = normalize_location_key(prefix)
+        if not key:
+            return []
+        self._ensure_loaded()
+        with self._lock:
+            return [
+                {'id': location_id, 'name': self._names[location_id], 'count': count}
+                for location_id, count in self._trie.complete(key, limit)
+            ]
+
+
+def _bump_version():
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    return cache.incr(VERSION_CACHE_KEY)
+
+
+_directory = LocationDirectory()
+
+
+def get_location_directory():
+    """The shared, lazily loaded directory for this process"""
+    return _directory
@@ -0,0 +1,154 @@
+"""
+MinHash signatures and a banded LSH index over jobs.
+
+A MinHash signature keeps, for each of NUM_PERM hash permutations, the
+smallest hash of a job's tokens; the fraction of equal positions in two
+signatures estimates the Jaccard similarity of their token sets. The
+signature is cut into BANDS bands and each band is hashed into a bucket
+key stored in JobSignatureBucket, so jobs sharing any band are found
+with one indexed `key IN (...)` lookup instead of a scan of the
+catalogue. With 32 bands of 4 rows, pairs above ~50% similarity collide
+with high probability and pairs below ~20% rarely do.
+
+Signatures of different kinds (what the tokens describe) live side by
+side; the kind is mixed into bucket keys so their buckets never meet.
+"""
+import hashlib
+import random
+import struct
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Subquery
+
+
+NUM_PERM = 128
+BANDS = 32
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(61)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+_PACKED = struct.Struct(f'<{NUM_PERM}Q')
+
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little') % _PRIME
+
+
+def signature(tokens):
+    """MinHash signature of a token set as a list of ints, or None when it is empty"""
+    hashes = [_token_hash(token) for token in set(tokens)]
+    if not hashes:
+        return None
+    return [min((a * value + b) % _PRIME for value in hashes) for a, b in _PERMUTATIONS]
+
+
+def pack(values):
+    return _PACKED.pack(*values)
+
+
+def unpack(data):
+    return list(_PACKED.unpack(bytes(data)))
+
+
+def band_keys(values, kind, bands=BANDS):
+    """Signed 64-bit bucket keys, one per band"""
+    rows = len(values) // bands
+    keys = []
+    for band in range(bands):
+        chunk = ','.join(map(str, values[band * rows:(band + 1) * rows]))
+        digest = hashlib.blake2b(f'{kind}:{band}:{chunk}'.encode(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+class LSHIndex:
+    """Stored signatures and bucket keys of one kind"""
+
+    def __init__(self, kind):
+        self.kind = kind
+
+    def stored_signature(self, job_id):
+        from .models import JobSignature
+
+        data = JobSignature.objects.filter(job_id=job_id, kind=self.kind).values_list('signature', flat=True).first()
+        return unpack(data) if data is not None else None
+
+    def update(self, job_id, tokens):
+        """Store the signature of a job's tokens; a no-op when it did not change"""
+        from .models import JobSignature, JobSignatureBucket
+
+        values = signature(tokens)
+        if values == self.stored_signature(job_id):
+            return
+        with transaction.atomic():
+            JobSignature.objects.filter(job_id=job_id, kind=self.kind).delete()
+            if values is None:
+                return
+            stored = JobSignature.objects.create(job_id=job_id, kind=self.kind, signature=pack(values))
+            JobSignatureBucket.objects.bulk_create(
+                [JobSignatureBucket(signature=stored, key=key) for key in band_keys(values, self.kind)]
+            )
+
+    def query(self, values, *conditions, exclude=(), threshold=0.0, **filters):
+        """
+        [(job id, estimated similarity)] of jobs sharing a bucket with the
+        signature `values`, most similar first. `conditions` (Q objects) and
+        `filters` are applied to the candidate JobSignature rows, e.g.
+        job__is_active=True.
+        """
+        from .models import JobSignature
+
+        matching = JobSignature.objects.filter(kind=self.kind, buckets__key__in=band_keys(values, self.kind))
+        rows = list(
+            JobSignature.objects
+            .filter(*conditions, pk__in=Subquery(matching.values('pk')), **filters)
+            .exclude(job_id__in=list(exclude))
+            .values_list('job_id', 'signature')
+        )
+        if not rows:
+            return []
+        job_ids = np.array([job_id for job_id, _ in rows])
+        signatures = np.frombuffer(b''.join(bytes(data) for _, data in rows), dtype='<u8').reshape(len(rows), NUM_PERM)
+        scores = (signatures == np.array(values, dtype=np.uint64)).mean(axis=1)
+        keep = scores >= threshold
+        order = np.lexsort((-job_ids[keep], -scores[keep]))
+        return [(int(job_id), float(score)) for job_id, score in zip(job_ids[keep][order], scores[keep][order])]
+
+    def rebuild(self, tokens_by_job, batch_size=1000):
+        """
+        Replace every signature of this kind from (job id, tokens) pairs.
+        Returns the number of signatures written.
+        """
+        from .models import JobSignature, JobSignatureBucket
+
+        written = 0
+        pending = []
+
+        def flush():
+            nonlocal written
+            stored = JobSignature.objects.bulk_create(
+                [JobSignature(job_id=job_id, kind=self.kind, signature=pack(values)) for job_id, values in pending]
+            )
+            JobSignatureBucket.objects.bulk_create(
+                [
+                    JobSignatureBucket(signature=row, key=key)
+                    for row, (_, values) in zip(stored, pending)
+                    for key in band_keys(values, self.kind)
+                ],
+                batch_size=batch_size,
+            )
+            written += len(pending)
+            pending.clear()
+
+        with transaction.atomic():
+            JobSignature.objects.filter(kind=self.kind).delete()
+            for job_id, tokens in tokens_by_job:
+                values = signature(tokens)
+                if values is not None:
+                    pending.append((job_id, values))
+                if len(pending) >= batch_size:
+                    flush()
+            if pending:
+                flush()
+        return written
@@ -0,0 +1,81 @@
+"""
+Django management command benchmarking reverse (job -> seekers) ranking.
+Usage: python manage.py benchmark_candidate_ranking [--profiles 1000000] [--jobs 20] [--scan-jobs 3]
+
+Compares scoring every seeker against a job with counting only the
+seekers found through a skill -> profile postings index, which is how
+SeekerJobMatch rows for the suggested candidates view are produced from
+ProfileSkill. Runs on synthetic data and does not touch the database.
+"""
+import heapq
+import random
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from jobs.match_store import _score
+from jobs.pagination import JOB_LIST_PAGE_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks inverted-index candidate ranking against a full scan of seekers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=1000000, help='Number of synthetic seekers')
+        parser.add_argument('--jobs', type=int, default=20, help='Jobs ranked with the postings index')
+        parser.add_argument('--scan-jobs', type=int, default=3, help='Jobs ranked with the full scan')
+        parser.add_argument('--skills', type=int, default=2000, help='Size of the skill vocabulary')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        vocabulary = list(range(options['skills']))
+        # Popular skills are far more common than rare ones
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+        def random_skills(low, high):
+            return frozenset(rng.choices(vocabulary, weights, k=rng.randint(low, high)))
+
+        seekers = [random_skills(0, 12) for _ in range(options['profiles'])]
+        jobs = [random_skills(2, 8) for _ in range(options['jobs'])]
+
+        start = time.perf_counter()
+        postings = {}
+        for profile_id, skills in enumerate(seekers):
+            for skill in skills:
+                postings.setdefault(skill, []).append(profile_id)
+        build_time = time.perf_counter() - start
+
+        def top_page(scored):
+            return heapq.nlargest(JOB_LIST_PAGE_SIZE, ((score, profile_id) for profile_id, score in scored if score))
+
+        scan_jobs = jobs[:options['scan_jobs']]
+        start = time.perf_counter()
+        expected = [
+            top_page((profile_id, _score(len(job & skills), len(job))) for profile_id, skills in enumerate(seekers))
+            for job in scan_jobs
+        ]
+        scan_time = (time.perf_counter() - start) / len(scan_jobs)
+
+        start = time.perf_counter()
+        actual = []
+        candidates = 0
+        for job in jobs:
+            shared = Counter()
+            for skill in job:
+                shared.update(postings.get(skill, ()))
+            candidates += len(shared)
+            actual.append(top_page((profile_id, _score(count, len(job))) for profile_id, count in shared.items()))
+        index_time = (time.perf_counter() - start) / len(jobs)
+
+        if actual[:len(expected)] != expected:
+            self.stdout.write(self.style.ERROR('Postings results differ from the full scan!'))
+            return
+
+        self.stdout.write(f"{len(seekers)} seekers, {len(jobs)} jobs, first page of {JOB_LIST_PAGE_SIZE}")
+        self.stdout.write(f"Postings build:     {build_time:9.2f} s")
+        self.stdout.write(f"Full scan:          {scan_time * 1000:9.1f} ms/job")
+        self.stdout.write(f"Postings index:     {index_time * 1000:9.1f} ms/job "
+                          f"({candidates // len(jobs)} candidates/job on average)")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {scan_time / index_time:.1f}x, results identical"))
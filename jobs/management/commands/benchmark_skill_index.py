@@ -0,0 +1,66 @@
+"""
+Django management command comparing top-K job matching strategies.
+Usage: python manage.py benchmark_skill_index [--jobs 10000] [--seekers 200] [--top 10]
+
+Runs on synthetic, unsaved data and does not touch the database.
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import Profile
+from jobs.models import Job
+from jobs.skill_index import SkillIndex
+from jobs.skills import parse_skills
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the in-memory skill index against the per-job match loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=10000, help='Number of synthetic jobs')
+        parser.add_argument('--seekers', type=int, default=200, help='Number of synthetic seekers to score')
+        parser.add_argument('--skills', type=int, default=500, help='Size of the skill vocabulary')
+        parser.add_argument('--top', type=int, default=10, help='K in top-K')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        vocabulary = [f'skill{i}' for i in range(options['skills'])]
+        # Popular skills are far more common than rare ones
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+        def random_skills(low, high):
+            return ', '.join(set(rng.choices(vocabulary, weights, k=rng.randint(low, high))))
+
+        jobs = [Job(pk=pk, skills_required=random_skills(2, 8)) for pk in range(1, options['jobs'] + 1)]
+        seekers = [Profile(skills=random_skills(3, 12)) for _ in range(options['seekers'])]
+        k = options['top']
+
+        start = time.perf_counter()
+        index = SkillIndex()
+        index.build((job.pk, parse_skills(job.skills_required)) for job in jobs)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = []
+        for seeker in seekers:
+            scored = [(job.calculate_skill_match(seeker), job.pk) for job in jobs]
+            expected.append([(pk, score) for score, pk in sorted(scored, reverse=True)[:k] if score])
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = [index.top_jobs(parse_skills(seeker.skills), k=k) for seeker in seekers]
+        index_time = time.perf_counter() - start
+
+        if actual != expected:
+            self.stdout.write(self.style.ERROR('Index results differ from the per-job loop!'))
+            return
+
+        per_seeker = 1000 / len(seekers)
+        self.stdout.write(f"{len(jobs)} jobs, {len(seekers)} seekers, top {k}")
+        self.stdout.write(f"Index build:        {build_time * 1000:9.1f} ms")
+        self.stdout.write(f"Per-job loop:       {loop_time * per_seeker:9.3f} ms/seeker")
+        self.stdout.write(f"Skill index:        {index_time * per_seeker:9.3f} ms/seeker")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {loop_time / index_time:.1f}x, results identical"))
@@ -0,0 +1,118 @@
+"""
+Django management command to re-apply skill aliases to existing jobs and profiles.
+Usage: python manage.py canonicalize_skills [--dry-run] [--batch-size 1000]
+
+Run after changing SKILL_ALIASES. Skills text is rewritten with bulk
+updates, JobSkill / ProfileSkill links disagreeing with it are resynced,
+derived data (stored matches, application scores, search and in-memory
+indexes) is refreshed once at the end and skills no longer used anywhere
+are deleted.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import Profile
+from jobs import facets, match_store, search, skill_weights
+from jobs.models import Job, JobApplication, JobSkill, ProfileSkill, Skill
+from jobs.rescoring import rescore_applications
+from jobs.skill_index import get_skill_index
+from jobs.skills import (
+    canonical_skills_text, parse_skills, profile_skills_text, sync_job_skills, sync_profile_skills,
+)
+from jobs.typeahead import get_typeahead_index
+
+
+class Command(BaseCommand):
+    help = 'Rewrites job and profile skills with canonical names after alias changes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report changes without saving them')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk update')
+
+    def canonicalize(self, queryset, field, link_model, owner_field, sync, batch_size, dry_run, linked_text=None):
+        """
+        Rewrite `field` where it is not canonical and resync links that
+        disagree with the text; return the ids of the rows touched.
+        `linked_text` returns the text the links derive from when that is
+        more than `field`.
+        """
+        changed = []
+
+        def process(chunk):
+            links = {}
+            rows = link_model.objects.filter(**{f'{owner_field}_id__in': [instance.pk for instance in chunk]})
+            for owner_id, name in rows.values_list(f'{owner_field}_id', 'skill__name'):
+                links.setdefault(owner_id, set()).add(name)
+
+            rewritten = []
+            stale = []
+            for instance in chunk:
+                text = getattr(instance, field)
+                canonical = canonical_skills_text(text)
+                if canonical != text:
+                    if dry_run and len(changed) < 10:
+                        self.stdout.write(f'  {queryset.model.__name__} {instance.pk}: "{text}" -> "{canonical}"')
+                    setattr(instance, field, canonical)
+                    rewritten.append(instance)
+                elif set(parse_skills(linked_text(instance) if linked_text else canonical)) == links.get(instance.pk, set()):
+                    continue
+                stale.append(instance)
+                changed.append(instance.pk)
+
+            if not dry_run:
+                queryset.model.objects.bulk_update(rewritten, [field])
+                for instance in stale:
+                    sync(instance)
+
+        chunk = []
+        for instance in queryset.iterator(chunk_size=batch_size):
+            chunk.append(instance)
+            if len(chunk) >= batch_size:
+                process(chunk)
+                chunk = []
+        if chunk:
+            process(chunk)
+        return changed
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        dry_run = options['dry_run']
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            job_ids = self.canonicalize(
+                Job.objects.order_by('pk').only('id', 'skills_required'), 'skills_required', JobSkill, 'job',
+                sync_job_skills, batch_size, dry_run,
+            )
+            profile_ids = self.canonicalize(
+                Profile.objects.order_by('pk').only('id', 'skills', 'resume_skills'), 'skills', ProfileSkill, 'profile',
+                sync_profile_skills, batch_size, dry_run, linked_text=profile_skills_text,
+            )
+        self.stdout.write(f'{len(job_ids)} jobs and {len(profile_ids)} profiles need canonical skills')
+
+        if dry_run or not (job_ids or profile_ids):
+            self.stdout.write(self.style.SUCCESS('Nothing written' if dry_run else 'All skills already canonical'))
+            return
+
+        # bulk_update() sends no signals and leaves updated_at alone, so refresh
+        # what they would have; cached MatchResults are keyed on updated_at
+        changed_jobs = Job.objects.filter(pk__in=job_ids)
+        changed_jobs.update(updated_at=timezone.now())
+        match_store.rebuild_all(progress=self.stdout.write)
+        for job in changed_jobs.select_related('company'):
+            search.index_job(job)
+        get_skill_index().refresh_jobs(job_ids)
+        get_typeahead_index().refresh_jobs(changed_jobs)
+        facets.invalidate()
+        skill_weights.recount()
+        rescore_applications(JobApplication.objects.filter(Q(job_id__in=job_ids) | Q(seeker_id__in=profile_ids)))
+
+        unused, _ = Skill.objects.filter(job_skills__isnull=True, profile_skills__isnull=True).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Canonicalized {len(job_ids)} jobs and {len(profile_ids)} profiles, '
+            f'removed {unused} unused skills in {time.perf_counter() - start:.1f}s'
+        ))
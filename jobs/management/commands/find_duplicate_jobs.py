@@ -0,0 +1,42 @@
+"""
+Django management command to group near-duplicate job postings across the catalogue.
+Usage: python manage.py find_duplicate_jobs [--threshold 0.7] [--limit 50] [--rebuild]
+
+Only postings sharing an LSH bucket are compared (see jobs/duplicates.py),
+so the scan does not compare every pair of jobs.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.duplicates import DUPLICATE_THRESHOLD, group_duplicates, rebuild_all
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Groups job postings whose title and description nearly repeat each other'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=DUPLICATE_THRESHOLD, help='Minimum estimated similarity (0-1)')
+        parser.add_argument('--limit', type=int, default=50, help='Groups to print, largest first')
+        parser.add_argument('--rebuild', action='store_true', help='Recompute all signatures first')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['rebuild']:
+            self.stdout.write(f'{rebuild_all()} signatures rebuilt')
+
+        groups = group_duplicates(options['threshold'])
+        shown = groups[:options['limit']]
+        jobs = Job.objects.select_related('company').in_bulk([job_id for group in shown for job_id in group])
+        for number, group in enumerate(shown, 1):
+            self.stdout.write(f'Group {number} ({len(group)} postings):')
+            for job_id in group:
+                job = jobs[job_id]
+                status = 'listed' if job.is_active and job.is_verified else 'unlisted'
+                self.stdout.write(f'  #{job.pk} {job.title} at {job.company.name} ({status})')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(groups)} groups covering {sum(len(group) for group in groups)} postings '
+            f'in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,39 @@
+"""
+Django management command to delete resume files no profile or application references.
+Usage: python manage.py gc_resumes [--grace-hours 24] [--dry-run] [--recount]
+
+Reference counts are kept by signals (see jobs/resume_storage.py);
+--recount recomputes them from the profiles and applications first.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.resume_storage import GC_GRACE_PERIOD, collect_garbage, recount
+
+
+class Command(BaseCommand):
+    help = 'Deletes stored resumes that are no longer referenced'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=float, default=GC_GRACE_PERIOD.total_seconds() / 3600,
+            help='Keep blobs unreferenced or written more recently than this',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='List the files without deleting them')
+        parser.add_argument('--recount', action='store_true', help='Recompute reference counts first')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['recount']:
+            self.stdout.write(f'{recount()} referenced resumes recounted')
+
+        collected = collect_garbage(timedelta(hours=options['grace_hours']), dry_run=options['dry_run'])
+        for name in collected:
+            self.stdout.write(f'  {name}')
+
+        verb = 'would be deleted' if options['dry_run'] else 'deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(collected)} unreferenced resumes {verb} in {time.perf_counter() - start:.1f}s'
+        ))
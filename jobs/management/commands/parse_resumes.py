@@ -0,0 +1,49 @@
+"""
+Django management command to extract skills from queued resume uploads.
+Usage: python manage.py parse_resumes [--workers 4] [--batch-size 50] [--limit N] [--requeue]
+
+Resumes are queued as ResumeParse rows when they are uploaded. Run this
+from cron or a process supervisor; it exits once the queue is empty.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.models import ResumeParse
+from jobs.resume_parsing import PARSE_BATCH_SIZE, init_worker, process_queue, skill_vocabulary
+
+
+class Command(BaseCommand):
+    help = 'Parses queued resumes in a process pool and stores the detected skills on profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+        parser.add_argument('--batch-size', type=int, default=PARSE_BATCH_SIZE, help='Resumes claimed per batch')
+        parser.add_argument('--limit', type=int, help='Stop after this many resumes')
+        parser.add_argument(
+            '--requeue', action='store_true',
+            help='First reset failed and interrupted (processing) rows to pending',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['requeue']:
+            requeued = ResumeParse.objects.filter(status__in=['failed', 'processing']).update(status='pending', error='')
+            self.stdout.write(f'{requeued} resumes requeued')
+
+        vocabulary = skill_vocabulary()
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=options['workers'], initializer=init_worker, initargs=(vocabulary,),
+        ) as pool:
+            parsed, failed = process_queue(
+                pool, batch_size=options['batch_size'], limit=options['limit'], progress=self.stdout.write,
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Parsed {parsed} resumes ({failed} failed) against {len(vocabulary)} skill phrases '
+            f'in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,23 @@
+"""
+Django management command to recompute the precomputed seeker x job match table.
+Usage: python manage.py rebuild_skill_matches [--batch-size 5000]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.match_store import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the SeekerJobMatch table from the normalized skills'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        written = rebuild_all(batch_size=options['batch_size'], progress=self.stdout.write)
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {written} seeker/job matches in {time.perf_counter() - start:.1f}s')
+        )
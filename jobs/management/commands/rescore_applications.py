@@ -0,0 +1,36 @@
+"""
+Django management command to recompute stored application skill match percentages.
+Usage: python manage.py rescore_applications [--job JOB_ID] [--batch-size 1000] [--dry-run]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobApplication
+from jobs.rescoring import RESCORE_BATCH_SIZE, rescore_applications
+
+
+class Command(BaseCommand):
+    help = 'Recomputes JobApplication.skill_match_percentage from the current skills'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, help='Only rescore applications to this job id')
+        parser.add_argument('--batch-size', type=int, default=RESCORE_BATCH_SIZE, help='Applications per chunk')
+        parser.add_argument('--dry-run', action='store_true', help='Count stale scores without saving them')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        applications = JobApplication.objects.all()
+        if options['job']:
+            applications = applications.filter(job_id=options['job'])
+
+        checked, changed = rescore_applications(
+            applications,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            progress=self.stdout.write,
+        )
+        verb = 'would change' if options['dry_run'] else 'updated'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} applications, {verb} {changed} scores in {time.perf_counter() - start:.1f}s'
+        ))
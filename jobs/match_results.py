@@ -0,0 +1,66 @@
+"""
+Seeker x job match results for job pages.
+
+job_list, job_detail and apply_job show a seeker's score together with
+the matched and missing skills. match_results() computes all three from
+a single parse of each side (skill names are memoized per instance, see
+jobs/skills.py) and caches each result under the seeker's skills digest,
+the job id and the job's updated_at, so re-rendering a page costs one
+cache round trip. Editing a job moves updated_at and editing a profile
+changes the digest, so stale entries are never read again and simply
+expire. With IDF weighting the weights version is part of the key too.
+"""
+import hashlib
+from typing import NamedTuple
+
+from django.core.cache import cache
+
+from . import skill_weights
+from .skills import job_skill_names, profile_skill_names
+
+
+MATCH_CACHE_TIMEOUT = 60 * 60
+
+
+class MatchResult(NamedTuple):
+    score: int  # 0-100, as Job.calculate_skill_match()
+    matched: list  # Sorted skill names the seeker has
+    missing: list  # Sorted skill names the seeker lacks
+
+
+def compute_match(seeker_skills, job_skills):
+    """MatchResult of two sets of canonical skill names"""
+    matched = job_skills & seeker_skills
+    score = skill_weights.match_score(job_skills, matched) if seeker_skills else 0
+    return MatchResult(score, sorted(matched), sorted(job_skills - matched))
+
+
+def _cache_prefix(seeker_skills):
+    digest = hashlib.sha1(','.join(sorted(seeker_skills)).encode()).hexdigest()
+    if skill_weights.weighting_enabled():
+        return f'jobs:match:{digest}:w{skill_weights.current_version()}'
+    return f'jobs:match:{digest}'
+
+
+def match_results(profile, jobs):
+    """{job id: MatchResult} for a seeker and a page of jobs, in one cache round trip"""
+    seeker_skills = profile_skill_names(profile)
+    prefix = _cache_prefix(seeker_skills)
+    keys = {f'{prefix}:{job.pk}:{job.updated_at.timestamp()}': job for job in jobs}
+    cached = cache.get_many(keys)
+
+    results = {}
+    computed = {}
+    for key, job in keys.items():
+        result = cached.get(key)
+        if result is None:
+            result = computed[key] = compute_match(seeker_skills, job_skill_names(job))
+        results[job.pk] = result
+    if computed:
+        cache.set_many(computed, MATCH_CACHE_TIMEOUT)
+    return results
+
+
+def match_result(profile, job):
+    """MatchResult of one seeker and job"""
+    return match_results(profile, [job])[job.pk]
@@ -0,0 +1,171 @@
+"""
+Precomputed seeker x job skill matches.
+
+SeekerJobMatch holds the score and matched skills for every seeker/job
+pair sharing at least one skill; a missing row means a 0% match. Signals
+refresh only the rows of the job or seeker whose skills changed (see
+jobs/signals.py; a job's rows, one per seeker sharing a skill, are
+refreshed once the edit has committed), so pages that show a match read it with one indexed
+lookup instead of recomputing it. rebuild_all() recomputes the whole table
+in bulk and backs the rebuild_skill_matches command.
+
+Stored scores always count skills uniformly and order match rankings;
+pages display jobs.match_results, which follows the configured weighting.
+"""
+from collections import defaultdict
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Subquery
+
+from .models import JobApplication, JobSkill, ProfileSkill, SeekerJobMatch, Skill
+
+
+def _score(matched, total):
+    # Same arithmetic as Job.calculate_skill_match()
+    return round(matched / total * 100)
+
+
+def _chunks(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _apply(existing_rows, key_field, wanted, build, batch_size=500):
+    """
+    Bring the rows in `existing_rows` in line with `wanted`.
+
+    `wanted` maps the varying key (seeker or job id) to (score, matched
+    skills). Rows that no longer match are deleted and only new or changed
+    pairs are written.
+    """
+    existing = {
+        key: (score, matched)
+        for key, score, matched in existing_rows.values_list(key_field, 'score', 'matched_skills')
+    }
+    stale = [key for key in existing if key not in wanted]
+    changed = [build(key, *value) for key, value in wanted.items() if existing.get(key) != value]
+
+    with transaction.atomic():
+        for chunk in _chunks(stale, batch_size):
+            existing_rows.filter(**{f'{key_field}__in': chunk}).delete()
+        SeekerJobMatch.objects.bulk_create(
+            changed,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['seeker', 'job'],
+            update_fields=['score', 'matched_skills', 'updated_at'],
+        )
+
+
+def refresh_job_matches(job):
+    """Recompute the stored matches of every seeker against one job"""
+    job_skills = dict(JobSkill.objects.filter(job=job).values_list('skill_id', 'skill__name'))
+    matched = defaultdict(list)
+    if job_skills:
+        rows = ProfileSkill.objects.filter(
+            skill_id__in=list(job_skills), profile__role='seeker'
+        ).values_list('profile_id', 'skill_id')
+        for profile_id, skill_id in rows.iterator():
+            matched[profile_id].append(job_skills[skill_id])
+
+    wanted = {
+        seeker_id: (_score(len(names), len(job_skills)), ','.join(sorted(names)))
+        for seeker_id, names in matched.items()
+    }
+    _apply(
+        SeekerJobMatch.objects.filter(job=job), 'seeker_id', wanted,
+        lambda seeker_id, score, names: SeekerJobMatch(job=job, seeker_id=seeker_id, score=score, matched_skills=names),
+    )
+
+
+def refresh_seeker_matches(profile):
+    """Recompute the stored matches of one seeker against every job"""
+    wanted = {}
+    seeker_skills = {}
+    if profile.role == 'seeker':
+        seeker_skills = dict(ProfileSkill.objects.filter(profile=profile).values_list('skill_id', 'skill__name'))
+    if seeker_skills:
+        # All skills of every job sharing at least one skill with the seeker
+        candidates = JobSkill.objects.filter(skill_id__in=list(seeker_skills)).values('job_id')
+        rows = (
+            JobSkill.objects
+            .filter(job_id__in=Subquery(candidates))
+            .order_by('job_id')
+            .values_list('job_id', 'skill_id')
+        )
+        for job_id, group in groupby(rows.iterator(), key=lambda row: row[0]):
+            skill_ids = [skill_id for _, skill_id in group]
+            names = sorted(seeker_skills[skill_id] for skill_id in skill_ids if skill_id in seeker_skills)
+            wanted[job_id] = (_score(len(names), len(skill_ids)), ','.join(names))
+
+    _apply(
+        SeekerJobMatch.objects.filter(seeker=profile), 'job_id', wanted,
+        lambda job_id, score, names: SeekerJobMatch(seeker=profile, job_id=job_id, score=score, matched_skills=names),
+    )
+
+
+def rebuild_all(batch_size=5000, progress=None):
+    """
+    Recompute the whole SeekerJobMatch table from the skill link tables.
+
+    Seekers are indexed by skill in memory, then jobs are streamed in id
+    order and scored against the seekers sharing their skills. Returns the
+    number of rows written.
+    """
+    names = dict(Skill.objects.values_list('id', 'name'))
+    seekers_by_skill = defaultdict(list)
+    seeker_rows = ProfileSkill.objects.filter(profile__role='seeker').values_list('skill_id', 'profile_id')
+    for skill_id, profile_id in seeker_rows.iterator():
+        seekers_by_skill[skill_id].append(profile_id)
+
+    written = 0
+    pending = []
+
+    def flush():
+        nonlocal written, pending
+        SeekerJobMatch.objects.bulk_create(pending, batch_size=batch_size)
+        written += len(pending)
+        pending = []
+        if progress:
+            progress(f'{written} matches written')
+
+    with transaction.atomic():
+        SeekerJobMatch.objects.all().delete()
+        job_rows = JobSkill.objects.order_by('job_id').values_list('job_id', 'skill_id')
+        for job_id, group in groupby(job_rows.iterator(), key=lambda row: row[0]):
+            skill_ids = [skill_id for _, skill_id in group]
+            matched = defaultdict(list)
+            for skill_id in skill_ids:
+                for profile_id in seekers_by_skill.get(skill_id, ()):
+                    matched[profile_id].append(names[skill_id])
+            for profile_id, matched_names in matched.items():
+                pending.append(SeekerJobMatch(
+                    seeker_id=profile_id,
+                    job_id=job_id,
+                    score=_score(len(matched_names), len(skill_ids)),
+                    matched_skills=','.join(sorted(matched_names)),
+                ))
+            if len(pending) >= batch_size:
+                flush()
+        if pending:
+            flush()
+    return written
+
+
+def candidates_for_job(job):
+    """
+    Stored matches of every seeker sharing a skill with `job`, applicants excluded.
+
+    The rows were produced from the ProfileSkill skill -> profile index, so
+    the cost of ranking follows the number of seekers sharing a skill, not
+    the total number of seekers.
+    """
+    applicants = JobApplication.objects.filter(job=job).values('seeker_id')
+    return (
+        SeekerJobMatch.objects
+        .filter(job=job)
+        .exclude(seeker_id__in=Subquery(applicants))
+        .select_related('seeker__user')
+    )
@@ -0,0 +1,60 @@
+"""
+Database-side skill matching.
+
+Mirrors Job.calculate_skill_match() as SQL expressions over the normalized
+JobSkill / ProfileSkill tables so that listings can be ordered and limited
+by match percentage in the database.
+"""
+from django.db.models import Case, Count, F, FloatField, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Floor, Mod
+from django.db.models.lookups import Exact, GreaterThan, LessThan
+
+from . import skill_weights
+from .models import ProfileSkill
+
+
+def match_percentage_expression(matched, total):
+    """
+    SQL equivalent of round(matched / total * 100) in Python.
+
+    The quotient is computed in double precision exactly as Python does it
+    and then rounded half to even like Python's round(); SQL ROUND() rounds
+    halves away from zero and would disagree on scores such as 12.5.
+    """
+    ratio = Cast(matched, FloatField()) / Cast(total, FloatField()) * Value(100.0)
+    whole = Floor(ratio)
+    fraction = ratio - whole
+    rounded = Case(
+        When(Exact(total, 0), then=Value(0.0)),
+        When(GreaterThan(fraction, 0.5), then=whole + Value(1.0)),
+        When(LessThan(fraction, 0.5), then=whole),
+        default=whole + Mod(whole, Value(2.0)),
+        output_field=FloatField(),
+    )
+    return Cast(rounded, IntegerField())
+
+
+def annotate_skill_match(queryset, seeker_profile):
+    """
+    Annotate a Job queryset with `skill_match`, the seeker's match percentage.
+
+    Scores equal Job.calculate_skill_match() for every job, so the queryset
+    can be ordered and sliced on skill_match without loading jobs into
+    Python. Both counts come from a single grouped join over JobSkill; with
+    IDF weighting they are sums of the skills' weights instead.
+    """
+    seeker_skills = ProfileSkill.objects.filter(profile=seeker_profile).values('skill_id')
+    if skill_weights.weighting_enabled():
+        weight = skill_weights.weight_expression(F('job_skills__skill__active_job_count'))
+        return queryset.annotate(
+            skill_match=match_percentage_expression(
+                Coalesce(Sum(weight, filter=Q(job_skills__skill_id__in=seeker_skills)), Value(0.0)),
+                Coalesce(Sum(weight), Value(0.0)),
+            )
+        )
+    return queryset.annotate(
+        skill_match=match_percentage_expression(
+            Count('job_skills', filter=Q(job_skills__skill_id__in=seeker_skills)),
+            Count('job_skills'),
+        )
+    )
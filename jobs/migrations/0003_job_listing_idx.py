@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_remove_jobapplication_job_and_more'),
+        ('jobs', '0002_alter_company_options_alter_jobapplication_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_verified', 'is_active', '-created_at', '-id'], name='job_listing_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:10
+
+from django.db import migrations
+
+
+# Frozen copy of the jobs.search table definition as of this migration
+FTS_TABLE = 'jobs_job_fts'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Job = apps.get_model('jobs', 'Job')
+    rows = Job.objects.values_list('id', 'title', 'description', 'skills_required', 'company__name')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "title, description, skills_required, company_name, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, skills_required, company_name) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            rows.iterator(),
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_listing_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
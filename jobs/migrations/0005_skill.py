@@ -0,0 +1,107 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def parse_skills(text):
+    """Frozen copy of jobs.skills.parse_skills as of this migration (no aliases)"""
+    if not text:
+        return []
+    names = []
+    seen = set()
+    for raw in text.split(','):
+        name = raw.strip().lower()
+        if name and name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def backfill_skills(apps, schema_editor):
+    """Parse existing comma-separated skills into the normalized tables"""
+    Job = apps.get_model('jobs', 'Job')
+    Profile = apps.get_model('accounts', 'Profile')
+    Skill = apps.get_model('jobs', 'Skill')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    ProfileSkill = apps.get_model('jobs', 'ProfileSkill')
+
+    job_skills = [(pk, parse_skills(text)) for pk, text in Job.objects.values_list('id', 'skills_required')]
+    profile_skills = [(pk, parse_skills(text)) for pk, text in Profile.objects.values_list('id', 'skills')]
+
+    names = {name for _, skills in job_skills + profile_skills for name in skills}
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    skill_ids = dict(Skill.objects.values_list('name', 'id'))
+
+    JobSkill.objects.bulk_create(
+        [JobSkill(job_id=pk, skill_id=skill_ids[name]) for pk, skills in job_skills for name in skills],
+        batch_size=1000, ignore_conflicts=True,
+    )
+    ProfileSkill.objects.bulk_create(
+        [ProfileSkill(profile_id=pk, skill_id=skill_ids[name]) for pk, skills in profile_skills for name in skills],
+        batch_size=1000, ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_remove_jobapplication_job_and_more'),
+        ('jobs', '0004_job_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_skills', to='accounts.profile')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('profiles', models.ManyToManyField(blank=True, related_name='skill_set', through='jobs.ProfileSkill', to='accounts.profile')),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='profileskill',
+            name='skill',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='profile_skills', to='jobs.skill'),
+        ),
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_skills', to='jobs.job')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_skills', to='jobs.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='skill_set',
+            field=models.ManyToManyField(blank=True, related_name='jobs', through='jobs.JobSkill', to='jobs.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='profileskill',
+            index=models.Index(fields=['skill', 'profile'], name='profileskill_skill_prof_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='profileskill',
+            unique_together={('profile', 'skill')},
+        ),
+        migrations.AddIndex(
+            model_name='jobskill',
+            index=models.Index(fields=['skill', 'job'], name='jobskill_skill_job_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobskill',
+            unique_together={('job', 'skill')},
+        ),
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
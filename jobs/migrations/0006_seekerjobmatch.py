@@ -0,0 +1,68 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:06
+
+from collections import defaultdict
+from itertools import groupby
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_matches(apps, schema_editor):
+    """Frozen copy of jobs.match_store.rebuild_all as of this migration"""
+    Skill = apps.get_model('jobs', 'Skill')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    ProfileSkill = apps.get_model('jobs', 'ProfileSkill')
+    SeekerJobMatch = apps.get_model('jobs', 'SeekerJobMatch')
+
+    names = dict(Skill.objects.values_list('id', 'name'))
+    seekers_by_skill = defaultdict(list)
+    seeker_rows = ProfileSkill.objects.filter(profile__role='seeker').values_list('skill_id', 'profile_id')
+    for skill_id, profile_id in seeker_rows.iterator():
+        seekers_by_skill[skill_id].append(profile_id)
+
+    pending = []
+    job_rows = JobSkill.objects.order_by('job_id').values_list('job_id', 'skill_id')
+    for job_id, group in groupby(job_rows.iterator(), key=lambda row: row[0]):
+        skill_ids = [skill_id for _, skill_id in group]
+        matched = defaultdict(list)
+        for skill_id in skill_ids:
+            for profile_id in seekers_by_skill.get(skill_id, ()):
+                matched[profile_id].append(names[skill_id])
+        for profile_id, matched_names in matched.items():
+            pending.append(SeekerJobMatch(
+                seeker_id=profile_id,
+                job_id=job_id,
+                score=round(len(matched_names) / len(skill_ids) * 100),
+                matched_skills=','.join(sorted(matched_names)),
+            ))
+        if len(pending) >= 5000:
+            SeekerJobMatch.objects.bulk_create(pending, batch_size=5000)
+            pending = []
+    SeekerJobMatch.objects.bulk_create(pending, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_remove_jobapplication_job_and_more'),
+        ('jobs', '0005_skill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeekerJobMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField()),
+                ('matched_skills', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seeker_matches', to='jobs.job')),
+                ('seeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_matches', to='accounts.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['seeker', '-score'], name='match_seeker_score_idx'), models.Index(fields=['job', '-score'], name='match_job_score_idx')],
+                'unique_together': {('seeker', 'job')},
+            },
+        ),
+        migrations.RunPython(backfill_matches, migrations.RunPython.noop),
+    ]
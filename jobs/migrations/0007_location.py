@@ -0,0 +1,97 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copies of jobs.locations helpers as of this migration
+_STRIP_CHARS = ' .,;:-'
+
+
+def clean_location_name(text):
+    name = ' '.join((text or '').split()).strip(_STRIP_CHARS)
+    return name.title() if name.islower() else name
+
+
+def normalize_location_key(text):
+    return clean_location_name(text).lower()
+
+
+# Common alternative spellings, mapped to the name jobs are listed under
+DEFAULT_ALIASES = {
+    'Bangalore': ['Bengaluru', 'Blr'],
+    'Mumbai': ['Bombay'],
+    'Chennai': ['Madras'],
+    'Kolkata': ['Calcutta'],
+    'Gurugram': ['Gurgaon'],
+    'Delhi': ['New Delhi'],
+    'Kochi': ['Cochin'],
+    'Thiruvananthapuram': ['Trivandrum'],
+    'Puducherry': ['Pondicherry'],
+    'Remote': ['Work From Home', 'WFH'],
+}
+
+
+def seed_locations(apps, schema_editor):
+    """Create the default aliases and point existing jobs at canonical locations"""
+    Job = apps.get_model('jobs', 'Job')
+    Location = apps.get_model('jobs', 'Location')
+    LocationAlias = apps.get_model('jobs', 'LocationAlias')
+
+    location_ids = {}
+    for name, aliases in DEFAULT_ALIASES.items():
+        location = Location.objects.create(name=name, key=normalize_location_key(name))
+        location_ids[location.key] = location.pk
+        for alias in aliases:
+            LocationAlias.objects.create(key=normalize_location_key(alias), location=location)
+    alias_ids = dict(LocationAlias.objects.values_list('key', 'location_id'))
+
+    by_location = {}
+    for pk, text in Job.objects.values_list('id', 'location'):
+        key = normalize_location_key(text)
+        if not key:
+            continue
+        location_id = alias_ids.get(key) or location_ids.get(key)
+        if location_id is None:
+            location_id = location_ids[key] = Location.objects.create(name=clean_location_name(text), key=key).pk
+        by_location.setdefault(location_id, []).append(pk)
+    for location_id, job_ids in by_location.items():
+        Job.objects.filter(pk__in=job_ids).update(canonical_location_id=location_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_seekerjobmatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('key', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='canonical_location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='jobs.location'),
+        ),
+        migrations.CreateModel(
+            name='LocationAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='jobs.location')),
+            ],
+            options={
+                'verbose_name_plural': 'Location aliases',
+            },
+        ),
+        migrations.RunPython(seed_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:23
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_listed_jobs(apps, schema_editor):
+    """Backfill how many active, verified jobs require each skill"""
+    Skill = apps.get_model('jobs', 'Skill')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+
+    listed_links = (
+        JobSkill.objects
+        .filter(skill=OuterRef('pk'), job__is_active=True, job__is_verified=True)
+        .values('skill')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    Skill.objects.update(active_job_count=Coalesce(Subquery(listed_links), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='active_job_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_listed_jobs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_profile_resume_skills'),
+        ('jobs', '0008_skill_active_job_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeParse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('skills', models.TextField(blank=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('parsed_at', models.DateTimeField(blank=True, null=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_parses', to='accounts.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='resume_parse_queue_idx')],
+                'unique_together': {('profile', 'file')},
+            },
+        ),
+    ]
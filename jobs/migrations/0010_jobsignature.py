@@ -0,0 +1,112 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:28
+
+import hashlib
+import random
+import re
+import struct
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copies of the jobs.lsh MinHash parameters and the jobs.similar_jobs
+# tokens as of this migration
+KIND = 'similar'
+NUM_PERM = 128
+BANDS = 32
+_PRIME = (1 << 61) - 1
+_rng = random.Random(61)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+_PACKED = struct.Struct(f'<{NUM_PERM}Q')
+_WORD = re.compile(r'[a-z0-9+#.]+')
+_TITLE_STOPWORDS = frozenset({'a', 'an', 'and', 'at', 'for', 'in', 'of', 'the', 'to', 'with', '-', '/'})
+
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little') % _PRIME
+
+
+def signature(tokens):
+    hashes = [_token_hash(token) for token in set(tokens)]
+    if not hashes:
+        return None
+    return [min((a * value + b) % _PRIME for value in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_keys(values):
+    rows = len(values) // BANDS
+    keys = []
+    for band in range(BANDS):
+        chunk = ','.join(map(str, values[band * rows:(band + 1) * rows]))
+        digest = hashlib.blake2b(f'{KIND}:{band}:{chunk}'.encode(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def backfill_signatures(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    JobSignature = apps.get_model('jobs', 'JobSignature')
+    JobSignatureBucket = apps.get_model('jobs', 'JobSignatureBucket')
+
+    # Canonical names from the JobSkill rows, as job_skill_names() returned them
+    skills = {}
+    for job_id, name in JobSkill.objects.values_list('job_id', 'skill__name').iterator():
+        skills.setdefault(job_id, set()).add(name)
+
+    def flush(pending):
+        stored = JobSignature.objects.bulk_create(
+            [JobSignature(job_id=job_id, kind=KIND, signature=_PACKED.pack(*values)) for job_id, values in pending]
+        )
+        JobSignatureBucket.objects.bulk_create(
+            [
+                JobSignatureBucket(signature=row, key=key)
+                for row, (_, values) in zip(stored, pending)
+                for key in band_keys(values)
+            ],
+            batch_size=1000,
+        )
+        pending.clear()
+
+    pending = []
+    for job in Job.objects.only('id', 'title').order_by('pk').iterator():
+        tokens = {f'skill:{name}' for name in skills.get(job.pk, ())}
+        tokens.update(f'title:{word}' for word in _WORD.findall(job.title.lower()) if word not in _TITLE_STOPWORDS)
+        values = signature(tokens)
+        if values is not None:
+            pending.append((job.pk, values))
+        if len(pending) >= 1000:
+            flush(pending)
+    if pending:
+        flush(pending)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_resumeparse'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('similar', 'Similar jobs')], max_length=20)),
+                ('signature', models.BinaryField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signatures', to='jobs.job')),
+            ],
+            options={
+                'unique_together': {('job', 'kind')},
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSignatureBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(db_index=True)),
+                ('signature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='jobs.jobsignature')),
+            ],
+        ),
+        migrations.RunPython(backfill_signatures, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:34
+
+import hashlib
+import random
+import re
+import struct
+
+from django.db import migrations, models
+
+
+# Frozen copies of the jobs.lsh MinHash parameters and the jobs.duplicates
+# shingles as of this migration
+KIND = 'duplicate'
+NUM_PERM = 128
+BANDS = 32
+SHINGLE_SIZE = 3
+_PRIME = (1 << 61) - 1
+_rng = random.Random(61)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+_PACKED = struct.Struct(f'<{NUM_PERM}Q')
+_WORD = re.compile(r'[a-z0-9+#]+')
+
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little') % _PRIME
+
+
+def signature(tokens):
+    hashes = [_token_hash(token) for token in set(tokens)]
+    if not hashes:
+        return None
+    return [min((a * value + b) % _PRIME for value in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_keys(values):
+    rows = len(values) // BANDS
+    keys = []
+    for band in range(BANDS):
+        chunk = ','.join(map(str, values[band * rows:(band + 1) * rows]))
+        digest = hashlib.blake2b(f'{KIND}:{band}:{chunk}'.encode(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def shingles(title, description):
+    words = _WORD.findall(f'{title} {description}'.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[start:start + SHINGLE_SIZE]) for start in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def backfill_signatures(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobSignature = apps.get_model('jobs', 'JobSignature')
+    JobSignatureBucket = apps.get_model('jobs', 'JobSignatureBucket')
+
+    def flush(pending):
+        stored = JobSignature.objects.bulk_create(
+            [JobSignature(job_id=job_id, kind=KIND, signature=_PACKED.pack(*values)) for job_id, values in pending]
+        )
+        JobSignatureBucket.objects.bulk_create(
+            [
+                JobSignatureBucket(signature=row, key=key)
+                for row, (_, values) in zip(stored, pending)
+                for key in band_keys(values)
+            ],
+            batch_size=1000,
+        )
+        pending.clear()
+
+    pending = []
+    for job in Job.objects.only('id', 'title', 'description').order_by('pk').iterator():
+        values = signature(shingles(job.title, job.description))
+        if values is not None:
+            pending.append((job.pk, values))
+        if len(pending) >= 1000:
+            flush(pending)
+    if pending:
+        flush(pending)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_jobsignature'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobsignature',
+            name='kind',
+            field=models.CharField(choices=[('similar', 'Similar jobs'), ('duplicate', 'Near-duplicates')], max_length=20),
+        ),
+        migrations.RunPython(backfill_signatures, migrations.RunPython.noop),
+    ]
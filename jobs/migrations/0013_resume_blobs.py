@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:40
+
+from collections import Counter
+
+import jobs.resume_storage
+from django.db import migrations, models
+
+
+def backfill_reference_counts(apps, schema_editor):
+    """Count the profiles and applications referencing each stored resume"""
+    ResumeBlob = apps.get_model('jobs', 'ResumeBlob')
+    counts = Counter()
+    for model in (apps.get_model('accounts', 'Profile'), apps.get_model('jobs', 'JobApplication')):
+        counts.update(model.objects.exclude(resume='').exclude(resume=None).values_list('resume', flat=True).iterator())
+    ResumeBlob.objects.bulk_create(
+        [ResumeBlob(name=name, ref_count=count) for name, count in counts.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_profile_resume_storage'),
+        ('jobs', '0012_application_status_changes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='resume',
+            field=models.FileField(storage=jobs.resume_storage.resume_storage, upload_to='resumes/'),
+        ),
+        migrations.RunPython(backfill_reference_counts, migrations.RunPython.noop),
+    ]
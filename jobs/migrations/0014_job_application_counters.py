@@ -0,0 +1,43 @@
+# Generated by Django 6.0.1 on 2026-10-18 22:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+STATUSES = ['pending', 'reviewed', 'shortlisted', 'rejected', 'hired']
+
+
+def backfill_counters(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobApplicationCounter = apps.get_model('jobs', 'JobApplicationCounter')
+    counts = Job.objects.order_by().annotate(
+        total=models.Count('applications'),
+        **{status: models.Count('applications', filter=models.Q(applications__status=status)) for status in STATUSES}
+    ).values('pk', 'total', *STATUSES)
+    JobApplicationCounter.objects.bulk_create(
+        [JobApplicationCounter(job_id=row.pop('pk'), **row) for row in counts.iterator()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_resume_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationCounter',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='application_counter', serialize=False, to='jobs.job')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('reviewed', models.PositiveIntegerField(default=0)),
+                ('shortlisted', models.PositiveIntegerField(default=0)),
+                ('rejected', models.PositiveIntegerField(default=0)),
+                ('hired', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
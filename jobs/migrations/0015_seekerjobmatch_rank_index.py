@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-18 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_profile_resume_storage'),
+        ('jobs', '0014_job_application_counters'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='seekerjobmatch',
+            name='match_job_score_idx',
+        ),
+        migrations.AddIndex(
+            model_name='seekerjobmatch',
+            index=models.Index(fields=['job', '-score', '-seeker'], name='match_job_rank_idx'),
+        ),
+    ]
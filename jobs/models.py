@@ -1,7 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from accounts.models import Profile
 
+from .match_results import compute_match
+from .resume_storage import resume_storage
+from .skills import job_skill_names, parse_skills, profile_skill_names
+
 
 class Company(models.Model):
     name = models.CharField(max_length=255)
@@ -27,6 +31,30 @@ class Company(models.Model):
         verbose_name_plural = "Companies"
 
 
+class Location(models.Model):
+    """Canonical job location that free-text Job.location values resolve to"""
+    name = models.CharField(max_length=255)  # Display name, e.g. "Bangalore"
+    key = models.CharField(max_length=255, unique=True)  # Normalized lookup key
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class LocationAlias(models.Model):
+    """Alternative spelling resolving to a canonical location, e.g. Bengaluru -> Bangalore"""
+    key = models.CharField(max_length=255, unique=True)  # Normalized alias
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='aliases')
+
+    class Meta:
+        verbose_name_plural = "Location aliases"
+
+    def __str__(self):
+        return f"{self.key} -> {self.location}"
+
+
 class Job(models.Model):
     JOB_TYPE_CHOICES = [
         ('FT', 'Full Time'),
@@ -47,6 +75,13 @@ class Job(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     location = models.CharField(max_length=255)
+    canonical_location = models.ForeignKey(
+        Location,
+        on_delete=models.SET_NULL,
+        related_name='jobs',
+        null=True,
+        blank=True
+    )  # Resolved from `location` on save
     salary = models.CharField(max_length=100)
     job_type = models.CharField(max_length=2, choices=JOB_TYPE_CHOICES)
     skills_required = models.TextField(help_text="Comma-separated list of skills")
@@ -57,36 +92,127 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Normalized copy of skills_required, maintained by jobs.signals
+    skill_set = models.ManyToManyField('Skill', through='JobSkill', related_name='jobs', blank=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the public job list
+            models.Index(fields=['is_verified', 'is_active', '-created_at', '-id'], name='job_listing_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} at {self.company.name}"
 
     def get_skills_list(self):
         """Return skills as a list"""
-        return [skill.strip().lower() for skill in self.skills_required.split(',') if skill.strip()]
+        return parse_skills(self.skills_required)
 
     def calculate_skill_match(self, seeker_profile):
         """Calculate skill match percentage with a job seeker"""
-        if not seeker_profile.skills:
-            return 0
-        
-        job_skills = set(self.get_skills_list())
-        seeker_skills = set([s.strip().lower() for s in seeker_profile.skills.split(',') if s.strip()])
-        
-        if not job_skills:
-            return 0
-        
-        matching_skills = job_skills.intersection(seeker_skills)
-        match_percentage = (len(matching_skills) / len(job_skills)) * 100
-        return round(match_percentage)
+        return self.match_with(seeker_profile).score
 
     def get_matching_skills(self, seeker_profile):
         """Get list of matching skills"""
-        if not seeker_profile.skills:
-            return []
-        
-        job_skills = set(self.get_skills_list())
-        seeker_skills = set([s.strip().lower() for s in seeker_profile.skills.split(',') if s.strip()])
-        return list(job_skills.intersection(seeker_skills))
+        return self.match_with(seeker_profile).matched
+
+    def match_with(self, seeker_profile):
+        """Score, matched and missing skills together; see jobs.match_results"""
+        return compute_match(profile_skill_names(seeker_profile), job_skill_names(self))
+
+
+class Skill(models.Model):
+    """Canonical skill name shared by job postings and seeker profiles"""
+    name = models.CharField(max_length=255, unique=True)  # Lowercased, stripped
+    profiles = models.ManyToManyField(Profile, through='ProfileSkill', related_name='skill_set', blank=True)
+    active_job_count = models.PositiveIntegerField(default=0)  # Listed jobs requiring it, see jobs.skill_weights
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class JobSkill(models.Model):
+    """A skill required by a job"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_skills')
+
+    class Meta:
+        unique_together = ('job', 'skill')
+        indexes = [
+            # "Jobs requiring X" and skill-overlap lookups
+            models.Index(fields=['skill', 'job'], name='jobskill_skill_job_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} requires {self.skill}"
+
+
+class ProfileSkill(models.Model):
+    """A skill listed on a seeker profile"""
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='profile_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='profile_skills')
+
+    class Meta:
+        unique_together = ('profile', 'skill')
+        indexes = [
+            models.Index(fields=['skill', 'profile'], name='profileskill_skill_prof_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id} has {self.skill}"
+
+
+class SeekerJobMatch(models.Model):
+    """Precomputed skill match of a seeker against a job (only stored when non-zero)"""
+    seeker = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='job_matches')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='seeker_matches')
+    score = models.PositiveSmallIntegerField()  # Same value as Job.calculate_skill_match()
+    matched_skills = models.TextField(blank=True)  # Comma-separated canonical names
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('seeker', 'job')
+        indexes = [
+            models.Index(fields=['seeker', '-score'], name='match_seeker_score_idx'),
+            # Candidate ranking order, see jobs.pagination.paginate_by_match
+            models.Index(fields=['job', '-score', '-seeker'], name='match_job_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.seeker_id} x {self.job_id}: {self.score}%"
+
+    def get_matched_skills_list(self):
+        return self.matched_skills.split(',') if self.matched_skills else []
+
+
+class JobSignature(models.Model):
+    """MinHash signature of a job's tokens, see jobs.lsh"""
+    KIND_CHOICES = [
+        ('similar', 'Similar jobs'),  # Skills and title words
+        ('duplicate', 'Near-duplicates'),  # Title and description shingles
+    ]
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='signatures')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    signature = models.BinaryField()  # Packed little-endian uint64 values
+
+    class Meta:
+        unique_together = ('job', 'kind')
+
+    def __str__(self):
+        return f"{self.job_id} ({self.kind})"
+
+
+class JobSignatureBucket(models.Model):
+    """LSH bucket key of one band of a signature"""
+    signature = models.ForeignKey(JobSignature, on_delete=models.CASCADE, related_name='buckets')
+    key = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"{self.key} -> {self.signature_id}"
 
 
 class JobApplication(models.Model):
@@ -105,7 +231,7 @@ class JobApplication(models.Model):
         limit_choices_to={'role': 'seeker'},
         related_name='job_applications'
     )
-    resume = models.FileField(upload_to='resumes/')
+    resume = models.FileField(upload_to='resumes/', storage=resume_storage)
     cover_letter = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     skill_match_percentage = models.IntegerField(default=0)  # Stored skill match
@@ -123,7 +249,81 @@ class JobApplication(models.Model):
         # Calculate skill match on save
         if not self.skill_match_percentage:
             self.skill_match_percentage = self.job.calculate_skill_match(self.seeker)
-        super().save(*args, **kwargs)
+        # Signals update the job's JobApplicationCounter in the same transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class JobApplicationCounter(models.Model):
+    """A job's application counts, total and per status, see jobs.application_counts"""
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='application_counter')
+    total = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    reviewed = models.PositiveIntegerField(default=0)
+    shortlisted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    hired = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.job_id}: {self.total} applications"
+
+
+class ApplicationStatusChange(models.Model):
+    """Append-only audit trail of application status transitions"""
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='status_changes')
+    from_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        Profile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='application_status_changes'
+    )
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-changed_at']
+
+    def __str__(self):
+        return f"{self.application}: {self.from_status} -> {self.to_status}"
+
+
+class ResumeBlob(models.Model):
+    """Number of profiles and applications referencing a stored resume file"""
+    name = models.CharField(max_length=255, unique=True)  # Storage name, see jobs.resume_storage
+    ref_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+
+class ResumeParse(models.Model):
+    """Queued skill extraction from an uploaded resume, processed by the parse_resumes command"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='resume_parses')
+    file = models.CharField(max_length=255)  # Storage name of the profile or application resume
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    skills = models.TextField(blank=True)  # Detected canonical skills, comma-separated like Profile.skills
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    parsed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('profile', 'file')
+        indexes = [
+            models.Index(fields=['status', 'id'], name='resume_parse_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.file} ({self.status})"
 
 
 class JobReport(models.Model):
@@ -0,0 +1,165 @@
+"""
+Keyset (cursor) pagination for job listings.
+
+Pages are addressed by an opaque cursor holding the sort key of the last
+row shown instead of an OFFSET, so each page reads a bounded number of rows
+and jobs posted while a user is paging do not shift the pages they have
+not seen yet.
+"""
+import base64
+import heapq
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+JOB_LIST_PAGE_SIZE = 20
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded"""
+
+
+def encode_cursor(values):
+    """Encode a tuple of sort key values into an opaque URL-safe token"""
+    payload = [v.isoformat() if hasattr(v, 'isoformat') else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, size):
+    """Decode a token produced by encode_cursor() into a list of raw values"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(token) from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor(token)
+    return values
+
+
+def _parse_created_at(value):
+    created_at = parse_datetime(value) if isinstance(value, str) else None
+    if created_at is None:
+        raise InvalidCursor(value)
+    return created_at
+
+
+def _parse_id(value):
+    if not isinstance(value, int):
+        raise InvalidCursor(value)
+    return value
+
+
+class KeysetPage:
+    """One page of results plus the cursor pointing at the next page"""
+
+    def __init__(self, items, next_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _parse_score(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise InvalidCursor(value)
+    return value
+
+
+def _keyset_filter(fields, values):
+    """Q matching rows that sort strictly after `values` in descending order"""
+    condition = Q()
+    for position, field in enumerate(fields):
+        equal = {name: value for name, value in zip(fields[:position], values)}
+        condition |= Q(**equal, **{f'{field}__lt': values[position]})
+    return condition
+
+
+def _paginate_queryset(queryset, keys, cursor, page_size):
+    fields = [field for field, _ in keys]
+    queryset = queryset.order_by(*[f'-{field}' for field in fields])
+    if cursor:
+        raw = decode_cursor(cursor, len(keys))
+        values = [parse(value) for (_, parse), value in zip(keys, raw)]
+        queryset = queryset.filter(_keyset_filter(fields, values))
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, field) for field in fields])
+    return KeysetPage(rows, next_cursor)
+
+
+def paginate_by_recency(queryset, cursor=None, page_size=JOB_LIST_PAGE_SIZE):
+    """
+    Return a KeysetPage of `queryset` ordered newest first.
+
+    Rows are ordered by (created_at, id) descending; `id` breaks ties between
+    jobs posted in the same instant so the order is total. Only
+    page_size + 1 rows are fetched, the extra one telling us whether there
+    is a next page.
+    """
+    return _paginate_queryset(
+        queryset, [('created_at', _parse_created_at), ('id', _parse_id)], cursor, page_size
+    )
+
+
+def paginate_by_annotation(queryset, field, cursor=None, page_size=JOB_LIST_PAGE_SIZE):
+    """
+    Return a KeysetPage of `queryset` ordered by a numeric annotation, highest first.
+
+    Ties fall back to recency and id as in paginate_by_recency(); ordering,
+    the cursor condition and the LIMIT are all applied in SQL.
+    """
+    return _paginate_queryset(
+        queryset,
+        [(field, _parse_score), ('created_at', _parse_created_at), ('id', _parse_id)],
+        cursor, page_size,
+    )
+
+
+def paginate_by_match(queryset, cursor=None, page_size=JOB_LIST_PAGE_SIZE):
+    """
+    Return a KeysetPage of SeekerJobMatch rows, best score first.
+
+    Ties are broken by newer seeker id first. For the rows of one job this
+    is the order of the (job, -score, -seeker) index, so each page is a
+    short index range scan.
+    """
+    return _paginate_queryset(
+        queryset, [('score', _parse_score), ('seeker_id', _parse_id)], cursor, page_size
+    )
+
+
+def paginate_by_score(scored_keys, cursor=None, page_size=JOB_LIST_PAGE_SIZE):
+    """
+    Return a KeysetPage of (score, created_at, id) tuples, best score first.
+
+    `scored_keys` is an iterable of such tuples; the score may be an integer
+    match percentage or a float relevance. Ties on score fall back to
+    recency and then id, matching paginate_by_recency().
+    """
+    if cursor:
+        score, created_at, pk = decode_cursor(cursor, 3)
+        after = (_parse_score(score), _parse_created_at(created_at), _parse_id(pk))
+        scored_keys = (key for key in scored_keys if key < after)
+
+    rows = heapq.nlargest(page_size + 1, scored_keys)
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1])
+    return KeysetPage(rows, next_cursor)
@@ -0,0 +1,69 @@
+"""
+"Recommended for you" jobs for the seeker dashboard.
+
+The top K listed jobs by skill match come from the in-memory skill index,
+which only expands the best score buckets and picks ties with a heap, so
+no full sort of the catalogue happens. Jobs the seeker already applied to
+are excluded.
+
+Results are cached per seeker. The cache key includes a digest of the
+seeker's skills, the skill index version (bumped whenever a job is saved
+or deleted) and a per-seeker applications version bumped from
+JobApplication signals (see jobs/signals.py), so editing skills, posting
+or verifying jobs and applying all show up on the next page view without
+explicit deletes.
+"""
+import hashlib
+
+from django.core.cache import cache
+
+from . import skill_index
+from .models import Job, JobApplication
+from .skills import profile_skill_names
+
+
+RECOMMENDATION_COUNT = 5
+RECOMMENDATION_CACHE_TIMEOUT = 60 * 30
+
+
+def _applications_version_key(profile_id):
+    return f'jobs:recommendations:applied:{profile_id}'
+
+
+def _cache_key(profile, names, k):
+    catalogue_key = skill_index.VERSION_CACHE_KEY
+    applications_key = _applications_version_key(profile.pk)
+    versions = cache.get_many([catalogue_key, applications_key])
+    digest = hashlib.sha1(','.join(sorted(names)).encode()).hexdigest()
+    return (
+        f'jobs:recommendations:{profile.pk}:{k}:{digest}:'
+        f'{versions.get(catalogue_key, 0)}:{versions.get(applications_key, 0)}'
+    )
+
+
+def recommended_jobs(profile, k=RECOMMENDATION_COUNT):
+    """
+    Return up to k (job, score) pairs for a seeker, best match first.
+
+    Jobs come with their company loaded. Seekers without skills get none.
+    """
+    names = profile_skill_names(profile)
+    if not names:
+        return []
+
+    key = _cache_key(profile, names, k)
+    recommendations = cache.get(key)
+    if recommendations is None:
+        applied = JobApplication.objects.filter(seeker=profile).values_list('job_id', flat=True)
+        top = skill_index.top_jobs_for_profile(profile, k=k, exclude=applied)
+        jobs = Job.objects.select_related('company').in_bulk([job_id for job_id, _ in top])
+        recommendations = [(jobs[job_id], score) for job_id, score in top if job_id in jobs]
+        cache.set(key, recommendations, RECOMMENDATION_CACHE_TIMEOUT)
+    return recommendations
+
+
+def invalidate_seeker(profile_id):
+    """Make a seeker's cached recommendations stale; called when they apply"""
+    key = _applications_version_key(profile_id)
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
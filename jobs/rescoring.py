@@ -0,0 +1,83 @@
+"""
+Recompute stored JobApplication.skill_match_percentage values.
+
+The percentage is stored when a seeker applies, so editing a job's
+required skills leaves the scores of its applications stale while
+job_applicants keeps sorting on them. rescore_applications() streams the
+affected applications with iterator(), scores each chunk with the NumPy
+batch matcher against the normalized skill tables and writes only the
+changed scores back with bulk_update(), so memory use does not grow with
+the number of applications. With IDF weighting enabled the chunk is scored
+in Python with the current skill weights instead.
+"""
+from . import skill_weights
+from .batch_matching import SkillMatcher, load_job_skills, load_seeker_skills
+from .models import JobApplication
+
+
+RESCORE_BATCH_SIZE = 1000
+
+
+def _rescore_chunk(chunk):
+    """Set new scores on a chunk of applications and return the changed ones"""
+    job_ids = sorted({application.job_id for application in chunk})
+    job_skills = load_job_skills(job_ids)
+    seeker_skills = load_seeker_skills({application.seeker_id for application in chunk})
+    if skill_weights.weighting_enabled():
+        scores = []
+        for application in chunk:
+            names = job_skills.get(application.job_id, frozenset())
+            seeker = seeker_skills.get(application.seeker_id, frozenset())
+            scores.append(skill_weights.match_score(names, names & seeker) if seeker else 0)
+    else:
+        matcher = SkillMatcher([job_skills.get(job_id, ()) for job_id in job_ids])
+        job_rows = {job_id: row for row, job_id in enumerate(job_ids)}
+        scores = matcher.score_pairs(
+            [seeker_skills.get(application.seeker_id, ()) for application in chunk],
+            [job_rows[application.job_id] for application in chunk],
+        ).tolist()
+    changed = []
+    for application, score in zip(chunk, scores):
+        if application.skill_match_percentage != score:
+            application.skill_match_percentage = score
+            changed.append(application)
+    return changed
+
+
+def rescore_applications(applications=None, batch_size=RESCORE_BATCH_SIZE, dry_run=False, progress=None):
+    """
+    Recompute skill_match_percentage for a JobApplication queryset (all by default).
+
+    Returns (checked, changed). With dry_run nothing is written. `progress`
+    is called with a status line after every chunk.
+    """
+    if applications is None:
+        applications = JobApplication.objects.all()
+    rows = (
+        applications
+        .order_by('pk')
+        .only('id', 'job_id', 'seeker_id', 'skill_match_percentage')
+        .iterator(chunk_size=batch_size)
+    )
+
+    checked = changed = 0
+    chunk = []
+
+    def flush():
+        nonlocal checked, changed
+        updates = _rescore_chunk(chunk)
+        if updates and not dry_run:
+            JobApplication.objects.bulk_update(updates, ['skill_match_percentage'])
+        checked += len(chunk)
+        changed += len(updates)
+        chunk.clear()
+        if progress:
+            progress(f'{checked} applications checked, {changed} scores changed')
+
+    for application in rows:
+        chunk.append(application)
+        if len(chunk) >= batch_size:
+            flush()
+    if chunk:
+        flush()
+    return checked, changed
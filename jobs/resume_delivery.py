@@ -0,0 +1,144 @@
+"""
+Access-controlled resume downloads.
+
+Stored resumes are no longer served from MEDIA_URL: their URLs point at
+the download_resume view (see ContentAddressedStorage.url), which only
+lets through the seeker who uploaded the file, providers the file was
+sent to with an application, and staff.
+
+The transfer itself is handed to the web server when RESUME_SENDFILE is
+set ('x-accel-redirect' for nginx, with RESUME_ACCEL_PREFIX as the
+internal location mapped onto MEDIA_ROOT, or 'x-sendfile' for Apache /
+lighttpd). Otherwise the file is streamed in chunks, with single-range
+Range requests answered by 206 responses. Either way conditional
+requests are answered here first: content-addressed names carry their
+SHA-256, which is used as a strong ETag, so repeat views cost a 304.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .models import JobApplication
+from .resume_storage import resume_storage
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_DIGEST_NAME = re.compile(r'^([0-9a-f]{64})\.')
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def can_download(user, name):
+    """Whether `user` may read the stored resume `name`"""
+    if user.is_staff:
+        return True
+    profile = getattr(user, 'profile', None)
+    if profile is None:
+        return False
+    if profile.resume and profile.resume.name == name:
+        return True
+    return JobApplication.objects.filter(resume=name).filter(Q(seeker=profile) | Q(job__provider=profile)).exists()
+
+
+def _etag(name, stat):
+    match = _DIGEST_NAME.match(posixpath.basename(name))
+    if match:
+        return quote_etag(match.group(1))
+    # Files stored before content addressing
+    return quote_etag(f'{stat.st_size:x}-{stat.st_mtime_ns:x}')
+
+
+def _byte_range(header, size):
+    """(start, end) of a single satisfiable range, None to send the whole file, or False when unsatisfiable"""
+    match = _RANGE.match(header.replace(' ', ''))
+    if not match:
+        # Malformed or multiple ranges: ignoring Range is allowed
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read(path, start, length):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _sendfile_response(name, path):
+    response = HttpResponse()
+    if settings.RESUME_SENDFILE == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.RESUME_ACCEL_PREFIX.rstrip('/') + '/' + name
+    else:
+        response['X-Sendfile'] = path
+    # Let the web server set the type and ranges of the file it sends
+    del response['Content-Type']
+    return response
+
+
+def _streaming_response(request, path, size, etag):
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    byte_range = None
+    header = request.headers.get('Range')
+    # A Range with a stale If-Range validator gets the whole file
+    if header and request.headers.get('If-Range', etag) == etag:
+        byte_range = _byte_range(header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range is None:
+        start, end = 0, size - 1
+        response = StreamingHttpResponse(_read(path, 0, size), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read(path, start, end - start + 1), content_type=content_type, status=206)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = end - start + 1
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def serve(request, name):
+    """Response for a stored resume; the caller has checked can_download()"""
+    storage = resume_storage()
+    path = storage.path(name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404('Resume not found')
+
+    etag = _etag(name, stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if settings.RESUME_SENDFILE:
+            response = _sendfile_response(name, path)
+        else:
+            response = _streaming_response(request, path, stat.st_size, etag)
+        response['Content-Disposition'] = f'inline; filename="resume{posixpath.splitext(name)[1]}"'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,199 @@
+"""
+Skill extraction from uploaded resumes.
+
+Uploading a resume (profile form or job application) only queues a
+ResumeParse row from a post_save signal, so requests never wait on
+parsing. The parse_resumes command claims pending rows in batches and
+hands the files to a process pool. Workers stream the text instead of
+loading whole documents: DOCX paragraphs come from an incremental parse
+of word/document.xml inside the zip and PDF text page by page from
+pypdf. Each worker scans the text for known skills, meaning skill names
+required by some job plus their aliases, matched as phrases of up to a
+few words.
+
+The skills of the seeker's most recently uploaded parsed resume are
+stored in Profile.resume_skills. They are synced into ProfileSkill next
+to the entered skills, so they count in matching, recommendations and
+suggested candidates.
+"""
+import os
+import re
+import zipfile
+from collections import deque
+from xml.etree.ElementTree import iterparse
+
+from django.utils import timezone
+
+from .resume_storage import resume_storage
+from .skills import skill_aliases
+
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+MAX_RESUME_BYTES = 10 * 1024 * 1024
+PARSE_BATCH_SIZE = 50
+
+_TOKEN = re.compile(r'\.?[a-z0-9][a-z0-9+#.]*')
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _tokens(text):
+    # "Node.js," -> "node.js", "CI/CD" -> "ci", "cd"
+    return [token.rstrip('.') for token in _TOKEN.findall(text.lower())]
+
+
+def phrase_key(name):
+    """Token form skills are matched on, so punctuation differences do not matter"""
+    return ' '.join(_tokens(name))
+
+
+def iter_docx_text(path):
+    """Yield the text of each paragraph of a .docx file"""
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+        runs = []
+        for _, element in iterparse(document):
+            if element.tag == f'{_WORD_NS}t':
+                runs.append(element.text or '')
+            elif element.tag == f'{_WORD_NS}p':
+                yield ''.join(runs)
+                runs.clear()
+                element.clear()
+
+
+def iter_pdf_text(path):
+    """Yield the text of each page of a PDF"""
+    from pypdf import PdfReader
+
+    with open(path, 'rb') as stream:
+        for page in PdfReader(stream).pages:
+            yield page.extract_text() or ''
+
+
+def iter_resume_text(path):
+    if path.lower().endswith('.docx'):
+        return iter_docx_text(path)
+    return iter_pdf_text(path)
+
+
+class SkillDetector:
+    """Finds known skill phrases in streamed text"""
+
+    def __init__(self, vocabulary):
+        # vocabulary: {phrase key: canonical skill name}
+        self.vocabulary = vocabulary
+        self.max_words = max((key.count(' ') + 1 for key in vocabulary), default=0)
+
+    def detect(self, chunks):
+        found = set()
+        if not self.max_words:
+            return found
+        # Phrases may continue across paragraphs or pages, so the last few
+        # words are carried over
+        window = deque(maxlen=self.max_words)
+        for chunk in chunks:
+            for token in _tokens(chunk):
+                window.append(token)
+                words = list(window)
+                for start in range(len(words)):
+                    name = self.vocabulary.get(' '.join(words[start:]))
+                    if name:
+                        found.add(name)
+        return found
+
+
+def skill_vocabulary():
+    """{phrase key: canonical name} for skills some job requires, with their aliases"""
+    from .models import Skill
+
+    names = set(Skill.objects.filter(job_skills__isnull=False).values_list('name', flat=True).distinct())
+    vocabulary = {phrase_key(alias): name for alias, name in skill_aliases().items() if name in names}
+    vocabulary.update((phrase_key(name), name) for name in names)
+    vocabulary.pop('', None)
+    return vocabulary
+
+
+_detector = None
+
+
+def init_worker(vocabulary):
+    """Process pool initializer: build the detector once per worker"""
+    global _detector
+    _detector = SkillDetector(vocabulary)
+
+
+def parse_file(item):
+    """Worker entry point: (pk, path) -> (pk, sorted skill names, error)"""
+    pk, path = item
+    try:
+        if os.path.getsize(path) > MAX_RESUME_BYTES:
+            return pk, [], 'File too large'
+        return pk, sorted(_detector.detect(iter_resume_text(path))), ''
+    except Exception as exc:
+        return pk, [], f'{type(exc).__name__}: {exc}'[:255]
+
+
+def enqueue(profile, resume):
+    """Queue a newly uploaded resume file for parsing; already queued files are ignored"""
+    from .models import ResumeParse
+
+    if not resume or not resume.name.lower().endswith(SUPPORTED_EXTENSIONS):
+        return
+    ResumeParse.objects.get_or_create(profile=profile, file=resume.name)
+
+
+def update_profile_skills(profile_id):
+    """Store the skills of a seeker's latest parsed resume on their profile"""
+    from accounts.models import Profile
+    from .models import ResumeParse
+
+    latest = ResumeParse.objects.filter(profile_id=profile_id, status='done').order_by('-pk').first()
+    profile = Profile.objects.get(pk=profile_id)
+    skills = latest.skills if latest else ''
+    if profile.resume_skills != skills:
+        profile.resume_skills = skills
+        # Signals sync ProfileSkill and refresh stored matches
+        profile.save(update_fields=['resume_skills'])
+
+
+def _claim(batch_size):
+    """Mark up to batch_size pending rows as processing and return them"""
+    from .models import ResumeParse
+
+    ids = ResumeParse.objects.filter(status='pending').order_by('pk').values_list('pk', flat=True)[:batch_size]
+    # Conditional updates, so a row another worker claimed meanwhile is skipped
+    claimed = [pk for pk in ids if ResumeParse.objects.filter(pk=pk, status='pending').update(status='processing')]
+    return list(ResumeParse.objects.filter(pk__in=claimed))
+
+
+def process_queue(pool, batch_size=PARSE_BATCH_SIZE, limit=None, progress=None):
+    """
+    Parse pending resumes with `pool` (a ProcessPoolExecutor whose workers
+    were initialized with init_worker) until the queue is empty or
+    `limit` rows were handled. Returns (parsed, failed).
+    """
+    parsed = failed = 0
+    while limit is None or parsed + failed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - parsed - failed)
+        rows = {row.pk: row for row in _claim(size)}
+        if not rows:
+            break
+        items = [(row.pk, resume_storage().path(row.file)) for row in rows.values()]
+
+        profiles = set()
+        for pk, skills, error in pool.map(parse_file, items):
+            row = rows[pk]
+            row.skills = ', '.join(skills)
+            row.error = error
+            row.status = 'failed' if error else 'done'
+            row.parsed_at = timezone.now()
+            row.save(update_fields=['skills', 'error', 'status', 'parsed_at'])
+            if error:
+                failed += 1
+            else:
+                parsed += 1
+                profiles.add(row.profile_id)
+
+        for profile_id in profiles:
+            update_profile_skills(profile_id)
+        if progress:
+            progress(f'{parsed} resumes parsed, {failed} failed')
+    return parsed, failed
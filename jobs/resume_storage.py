@@ -0,0 +1,176 @@
+"""
+Content-addressed, deduplicating storage for uploaded resumes.
+
+Seekers upload the same file for every application, so resumes are
+stored once per distinct content: ContentAddressedStorage hashes an
+upload while streaming it to a temporary file and names it
+resumes/<ab>/<sha256>.<ext>, dropping the copy when that blob already
+exists. Profile.resume and JobApplication.resume both use it (the
+'resumes' entry of STORAGES), and its URLs lead to an access-checked
+download view rather than MEDIA_URL.
+
+Each stored name has a ResumeBlob row counting the profiles and
+applications that reference it, maintained by signals in jobs/signals.py.
+The gc_resumes command deletes blobs nobody references any more, after a
+grace period so that a file uploaded by a request still in flight is
+never collected before its row is saved.
+"""
+import hashlib
+import os
+import posixpath
+import tempfile
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps as django_apps
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+
+HASH_CHUNK_SIZE = 64 * 1024
+GC_GRACE_PERIOD = timedelta(hours=24)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage naming each file after the SHA-256 of its content"""
+
+    def get_available_name(self, name, max_length=None):
+        # _save() names the file after its content, so an existing name is not a clash
+        return name
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        os.makedirs(self.path(directory), exist_ok=True)
+
+        digest = hashlib.sha256()
+        handle, temp_path = tempfile.mkstemp(dir=self.path(directory), suffix='.part')
+        try:
+            with os.fdopen(handle, 'wb') as temp:
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+                    temp.write(chunk)
+            hexdigest = digest.hexdigest()
+            name = posixpath.join(directory, hexdigest[:2], hexdigest + extension)
+            path = self.path(name)
+            if os.path.exists(path):
+                # A fresh mtime keeps the blob out of gc_resumes until its row is saved
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.chmod(temp_path, self.file_permissions_mode or 0o644)
+                os.replace(temp_path, path)
+                temp_path = None
+        finally:
+            if temp_path:
+                os.remove(temp_path)
+        return name
+
+    def url(self, name):
+        # Served by the access-checked download_resume view, see jobs/resume_delivery.py
+        return reverse('download_resume', args=[name])
+
+
+def resume_storage():
+    return storages['resumes']
+
+
+def _blobs():
+    # Looked up lazily: accounts.models imports this module for the storage
+    return django_apps.get_model('jobs', 'ResumeBlob').objects
+
+
+def retain(name):
+    """Count one more reference to a stored resume"""
+    if not name:
+        return
+    blobs = _blobs()
+    if blobs.filter(name=name).update(ref_count=F('ref_count') + 1, updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            blobs.create(name=name, ref_count=1)
+    except IntegrityError:
+        # Created concurrently by another upload of the same file
+        blobs.filter(name=name).update(ref_count=F('ref_count') + 1, updated_at=timezone.now())
+
+
+def release(name):
+    """Count one reference less; unreferenced blobs are deleted by gc_resumes"""
+    if name:
+        _blobs().filter(name=name).update(ref_count=F('ref_count') - 1, updated_at=timezone.now())
+
+
+def recount():
+    """
+    Recompute every reference count from the profiles and applications.
+    Returns the number of referenced blobs.
+    """
+    counts = Counter()
+    for model in (django_apps.get_model('accounts', 'Profile'), django_apps.get_model('jobs', 'JobApplication')):
+        counts.update(model.objects.exclude(resume='').exclude(resume=None).values_list('resume', flat=True).iterator())
+
+    blobs = _blobs()
+    now = timezone.now()
+    with transaction.atomic():
+        existing = dict(blobs.values_list('name', 'ref_count'))
+        blobs.bulk_create(
+            [blobs.model(name=name, ref_count=count) for name, count in counts.items() if name not in existing],
+            batch_size=500,
+        )
+        for name, ref_count in existing.items():
+            if ref_count != counts.get(name, 0):
+                blobs.filter(name=name).update(ref_count=counts.get(name, 0), updated_at=now)
+    return len(counts)
+
+
+def _stored_files(storage, directory):
+    directories, files = storage.listdir(directory)
+    for filename in files:
+        yield posixpath.join(directory, filename)
+    for subdirectory in directories:
+        yield from _stored_files(storage, posixpath.join(directory, subdirectory))
+
+
+def collect_garbage(grace=GC_GRACE_PERIOD, dry_run=False, directory='resumes'):
+    """
+    Delete unreferenced resume blobs and return their names.
+
+    A blob is collected once its count has been zero, and its file
+    untouched, for longer than `grace`. Files under `directory` without a
+    referenced blob (uploads whose save was rolled back, interrupted
+    .part files) are collected after the same grace period.
+    """
+    storage = resume_storage()
+    blobs = _blobs()
+    cutoff = timezone.now() - grace
+
+    def expired(name):
+        return storage.exists(name) and storage.get_modified_time(name) < cutoff
+
+    collected = set()
+    for blob in blobs.filter(ref_count__lte=0, updated_at__lt=cutoff).iterator():
+        if not storage.exists(blob.name):
+            if not dry_run:
+                blobs.filter(pk=blob.pk, ref_count__lte=0).delete()
+            continue
+        if not expired(blob.name):
+            continue
+        if not dry_run:
+            # Conditional, so a blob referenced again meanwhile survives
+            if not blobs.filter(pk=blob.pk, ref_count__lte=0).delete()[0]:
+                continue
+            storage.delete(blob.name)
+        collected.add(blob.name)
+
+    if storage.exists(directory):
+        known = set(blobs.values_list('name', flat=True))
+        for name in _stored_files(storage, directory):
+            if name not in known and name not in collected and expired(name):
+                if not dry_run:
+                    storage.delete(name)
+                collected.add(name)
+    return sorted(collected)
@@ -0,0 +1,113 @@
+"""
+Full-text search over job postings.
+
+On SQLite the jobs are mirrored into an FTS5 virtual table (created by
+migration 0004) keyed by job id, so a search only touches the index entries
+of matching jobs and comes back ranked by BM25. The table is kept in sync
+from Job and Company signals (see jobs/signals.py). Other database backends
+fall back to the original icontains filters.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+
+FTS_TABLE = 'jobs_job_fts'
+
+# BM25 column weights: title, description, skills_required, company_name
+BM25_WEIGHTS = (10.0, 1.0, 5.0, 3.0)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def is_available():
+    """Whether the FTS5 index exists for the current database"""
+    return connection.vendor == 'sqlite'
+
+
+def build_match_expression(query):
+    """
+    Turn free text typed by a user into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all terms must match, so
+    "djan dev" finds "Django Developer". Returns None when the query holds
+    no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def index_job(job):
+    """Insert or refresh a job's row in the index"""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [job.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, skills_required, company_name) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            [job.pk, job.title, job.description, job.skills_required, job.company.name],
+        )
+
+
+def remove_job(job_id):
+    """Drop a job's row from the index"""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [job_id])
+
+
+def reindex_company(company):
+    """Propagate a company rename to the index rows of its jobs"""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {FTS_TABLE} SET company_name = %s "
+            "WHERE rowid IN (SELECT id FROM jobs_job WHERE company_id = %s)",
+            [company.name, company.pk],
+        )
+
+
+def ranked_matches(query):
+    """
+    Return {job_id: relevance} for jobs matching `query`, higher is better.
+
+    Only index entries of matching jobs are visited, so the cost depends on
+    the number of hits rather than the size of the catalogue.
+    """
+    expression = build_match_expression(query)
+    if expression is None:
+        return {}
+    weights = ', '.join(str(w) for w in BM25_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s",
+            [expression],
+        )
+        # bm25() is negative with the best match lowest; flip it so that
+        # larger means more relevant like every other score we sort on.
+        return {job_id: -rank for job_id, rank in cursor.fetchall()}
+
+
+def filter_jobs(queryset, query):
+    """Restrict a Job queryset to postings matching a free-text query"""
+    if not is_available():
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(skills_required__icontains=query) |
+            Q(company__name__icontains=query)
+        )
+    expression = build_match_expression(query)
+    if expression is None:
+        return queryset.none()
+    return queryset.filter(id__in=RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression]
+    ))
@@ -0,0 +1,272 @@
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from accounts.models import Profile
+
+from . import (
+    application_counts, duplicates, facets, match_store, recommendations, resume_parsing, resume_storage, search, similar_jobs, skill_weights,
+)
+from .locations import get_location_directory, resolve_location
+from .rescoring import rescore_applications
+from .skill_index import get_skill_index
+from .typeahead import get_typeahead_index
+from .models import Company, Job, JobApplication, JobApplicationCounter, JobSkill, Location, LocationAlias
+from .skills import canonical_skills_text, skill_aliases, sync_job_skills, sync_profile_skills
+
+
+@receiver(post_save, sender=Job)
+def index_job_for_search(sender, instance, **kwargs):
+    """Keep the full-text search index in sync with job edits"""
+    search.index_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_from_search(sender, instance, **kwargs):
+    search.remove_job(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+def reindex_company_jobs(sender, instance, created, **kwargs):
+    """Company names are searchable, so renames must reach the index"""
+    if not created:
+        search.reindex_company(instance)
+
+
+@receiver(pre_save, sender=Job)
+def remember_previous_job(sender, instance, **kwargs):
+    """Load the stored state later receivers compare the save against, in one query"""
+    previous = None
+    if instance.pk:
+        previous = (
+            Job.objects.filter(pk=instance.pk)
+            .values('title', 'company_id', 'skills_required', 'location', 'canonical_location_id', 'is_active', 'is_verified')
+            .first()
+        )
+    instance._previous_state = previous
+
+
+def _changed(instance, *fields):
+    """Whether a saved job or profile is new or any of `fields` differs from its pre_save state"""
+    previous = getattr(instance, '_previous_state', None)
+    return previous is None or any(previous[field] != getattr(instance, field) for field in fields)
+
+
+@receiver(pre_save, sender=Job)
+def canonicalize_job_skills(sender, instance, **kwargs):
+    """Store canonical skill names so aliases never reach the read path"""
+    instance.skills_required = canonical_skills_text(instance.skills_required)
+
+
+@receiver(pre_save, sender=Profile)
+def canonicalize_profile_skills(sender, instance, **kwargs):
+    instance.skills = canonical_skills_text(instance.skills)
+    instance.resume_skills = canonical_skills_text(instance.resume_skills)
+
+
+@receiver(setting_changed)
+def reset_skill_aliases(sender, setting, **kwargs):
+    if setting == 'SKILL_ALIASES':
+        skill_aliases.cache_clear()
+
+
+@receiver(post_save, sender=Job)
+def update_job_skills(sender, instance, created, **kwargs):
+    """Normalize skills_required into JobSkill rows and refresh stored matches"""
+    previous = getattr(instance, '_previous_state', None)
+    added, removed = set(), set()
+    if _changed(instance, 'skills_required'):
+        added, removed = sync_job_skills(instance)
+    was_listed = bool(previous and previous['is_active'] and previous['is_verified'])
+    skill_weights.job_changed(instance, added, removed, was_listed)
+    if added or removed:
+        # Writes a row per seeker sharing a skill, so keep it out of the saving transaction
+        transaction.on_commit(lambda: match_store.refresh_job_matches(instance))
+        if not created:
+            # Scores stored on applications were computed against the old skills
+            rescore_applications(JobApplication.objects.filter(job=instance))
+
+
+@receiver(pre_delete, sender=Job)
+def release_skill_frequencies(sender, instance, **kwargs):
+    """A deleted listed job no longer counts towards its skills' rarity"""
+    if instance.is_active and instance.is_verified:
+        skill_weights.adjust(set(), set(JobSkill.objects.filter(job=instance).values_list('skill_id', flat=True)))
+
+
+@receiver(post_save, sender=Profile)
+def update_profile_skills(sender, instance, **kwargs):
+    """Normalize a profile's skills into ProfileSkill rows and refresh stored matches"""
+    # Every User save (each login, for last_login) re-saves the profile
+    if not _changed(instance, 'role', 'skills', 'resume_skills'):
+        return
+    added, removed = sync_profile_skills(instance)
+    if added or removed:
+        match_store.refresh_seeker_matches(instance)
+
+
+@receiver(post_save, sender=Job)
+def update_skill_index(sender, instance, **kwargs):
+    """Add, refresh or drop the job in the in-memory skill index"""
+    # Each update bumps the version and makes other processes reload
+    if _changed(instance, 'skills_required', 'is_active', 'is_verified'):
+        get_skill_index().update_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_from_skill_index(sender, instance, **kwargs):
+    get_skill_index().remove_job(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=LocationAlias)
+@receiver(post_delete, sender=LocationAlias)
+def invalidate_job_facets(sender, **kwargs):
+    """Cached job list facet counts depend on every job, company and location"""
+    facets.invalidate()
+
+
+@receiver(pre_save, sender=Job)
+def resolve_job_location(sender, instance, **kwargs):
+    """Point the job at the canonical Location for its free-text location"""
+    previous = getattr(instance, '_previous_state', None)
+    if previous is None or previous['location'] != instance.location or instance.canonical_location_id is None:
+        instance.canonical_location = resolve_location(instance.location)
+
+
+@receiver(post_save, sender=Job)
+def update_location_directory(sender, instance, **kwargs):
+    """Listed-job counts weight location suggestions"""
+    if not _changed(instance, 'canonical_location_id', 'is_active', 'is_verified'):
+        return
+    previous = getattr(instance, '_previous_state', None) or {}
+    get_location_directory().refresh_locations(
+        {instance.canonical_location_id, previous.get('canonical_location_id')}
+    )
+
+
+@receiver(post_delete, sender=Job)
+def remove_from_location_directory(sender, instance, **kwargs):
+    get_location_directory().refresh_locations({instance.canonical_location_id})
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def refresh_location(sender, instance, **kwargs):
+    get_location_directory().refresh_locations({instance.pk})
+
+
+@receiver(post_save, sender=LocationAlias)
+@receiver(post_delete, sender=LocationAlias)
+def refresh_location_aliases(sender, instance, **kwargs):
+    get_location_directory().refresh_locations({instance.location_id})
+
+
+@receiver(post_save, sender=Job)
+def update_job_signatures(sender, instance, **kwargs):
+    """MinHash signatures behind the similar jobs panel and duplicate detection"""
+    similar_jobs.update_job(instance)
+    duplicates.update_job(instance)
+
+
+@receiver(post_save, sender=Job)
+def update_typeahead(sender, instance, **kwargs):
+    """Titles, skills and company names of listed jobs feed search suggestions"""
+    if _changed(instance, 'title', 'skills_required', 'company_id', 'is_active', 'is_verified'):
+        get_typeahead_index().update_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_from_typeahead(sender, instance, **kwargs):
+    get_typeahead_index().remove_job(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+def refresh_company_typeahead(sender, instance, created, **kwargs):
+    if not created:
+        get_typeahead_index().refresh_jobs(instance.job_set.all())
+
+
+@receiver(post_save, sender=JobApplication)
+@receiver(post_delete, sender=JobApplication)
+def refresh_recommendations(sender, instance, **kwargs):
+    """Jobs a seeker applied to drop out of their recommendations"""
+    recommendations.invalidate_seeker(instance.seeker_id)
+
+
+@receiver(post_save, sender=Profile)
+def queue_profile_resume(sender, instance, **kwargs):
+    """Uploaded resumes are parsed later by the parse_resumes command"""
+    previous = getattr(instance, '_previous_resume', None)
+    if previous is not None and previous != (instance.resume.name or ''):
+        resume_parsing.enqueue(instance, instance.resume)
+
+
+@receiver(post_save, sender=JobApplication)
+def queue_application_resume(sender, instance, created, **kwargs):
+    if created:
+        resume_parsing.enqueue(instance.seeker, instance.resume)
+
+
+@receiver(pre_save, sender=Profile)
+def remember_previous_profile(sender, instance, update_fields=None, **kwargs):
+    """Load the stored skills, role and resume later receivers compare the save against, in one query"""
+    previous = None
+    if instance.pk:
+        previous = Profile.objects.filter(pk=instance.pk).values('role', 'skills', 'resume_skills', 'resume').first()
+    instance._previous_state = previous
+    # The stored resume name, or None when this save leaves the resume alone
+    instance._previous_resume = None
+    if update_fields is None or 'resume' in update_fields:
+        instance._previous_resume = (previous['resume'] if previous else '') or ''
+
+
+@receiver(pre_save, sender=JobApplication)
+def remember_previous_application(sender, instance, update_fields=None, **kwargs):
+    """Load the stored resume, job and status later receivers compare the save against, in one query"""
+    previous = None
+    if instance.pk:
+        previous = JobApplication.objects.filter(pk=instance.pk).values('resume', 'job_id', 'status').first()
+    instance._previous_state = previous
+    instance._previous_resume = None
+    if update_fields is None or 'resume' in update_fields:
+        instance._previous_resume = (previous['resume'] if previous else '') or ''
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=JobApplication)
+def count_resume_references(sender, instance, **kwargs):
+    """Keep ResumeBlob reference counts in step with the resumes in use"""
+    previous = getattr(instance, '_previous_resume', None)
+    current = instance.resume.name or ''
+    if previous is not None and current != previous:
+        resume_storage.retain(current)
+        resume_storage.release(previous)
+
+
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=JobApplication)
+def release_resume(sender, instance, **kwargs):
+    resume_storage.release(instance.resume.name)
+
+
+@receiver(post_save, sender=JobApplication)
+def count_application(sender, instance, **kwargs):
+    application_counts.application_saved(instance, instance._previous_state)
+
+
+@receiver(post_delete, sender=JobApplication)
+def uncount_application(sender, instance, **kwargs):
+    application_counts.application_deleted(instance)
+
+
+@receiver(post_save, sender=Job)
+def create_application_counter(sender, instance, created, **kwargs):
+    if created:
+        JobApplicationCounter.objects.create(job=instance)
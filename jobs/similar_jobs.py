@@ -0,0 +1,58 @@
+"""
+"Similar jobs" for the job detail page.
+
+A job's tokens are its canonical skills and the words of its title, so
+two postings are similar when they ask for the same skills and describe
+the role the same way. Their MinHash signatures are kept up to date from
+a Job post_save signal (see jobs/signals.py) and looked up through the
+LSH buckets in jobs/lsh.py, so finding similar jobs only touches the
+jobs sharing a bucket, however large the catalogue grows.
+"""
+import re
+
+from .lsh import LSHIndex
+from .models import Job
+from .skills import job_skill_names
+
+
+SIMILAR_JOBS_KIND = 'similar'
+SIMILAR_JOBS_COUNT = 5
+MIN_SIMILARITY = 0.25
+
+_WORD = re.compile(r'[a-z0-9+#.]+')
+_TITLE_STOPWORDS = frozenset({'a', 'an', 'and', 'at', 'for', 'in', 'of', 'the', 'to', 'with', '-', '/'})
+
+index = LSHIndex(SIMILAR_JOBS_KIND)
+
+
+def job_tokens(job):
+    tokens = {f'skill:{name}' for name in job_skill_names(job)}
+    tokens.update(
+        f'title:{word}' for word in _WORD.findall(job.title.lower()) if word not in _TITLE_STOPWORDS
+    )
+    return tokens
+
+
+def update_job(job):
+    index.update(job.pk, job_tokens(job))
+
+
+def rebuild_all():
+    """Recompute every similar-jobs signature"""
+    jobs = Job.objects.only('id', 'title', 'skills_required').order_by('pk')
+    return index.rebuild((job.pk, job_tokens(job)) for job in jobs.iterator())
+
+
+def similar_jobs(job, count=SIMILAR_JOBS_COUNT):
+    """
+    Up to `count` (job, similarity percentage) pairs of listed jobs
+    resembling `job`, most similar first, with companies loaded.
+    """
+    values = index.stored_signature(job.pk)
+    if values is None:
+        return []
+    top = index.query(
+        values, exclude={job.pk}, threshold=MIN_SIMILARITY, job__is_active=True, job__is_verified=True,
+    )[:count]
+    jobs = Job.objects.select_related('company').in_bulk([job_id for job_id, _ in top])
+    return [(jobs[job_id], round(score * 100)) for job_id, score in top if job_id in jobs]
@@ -0,0 +1,277 @@
+"""
+Process-wide inverted index from skill name to the active jobs requiring it.
+
+Every active, verified job gets a dense bit position; each skill maps to a
+Python integer used as a bitset over those positions. Scoring a seeker
+adds the bitsets of their skills into bit-sliced counters (one integer per
+bit of the count) so a single pass of bitwise operations yields, for every
+job at once, how many of its skills the seeker has. Jobs are also bucketed
+by how many skills they require, which turns "top K by match percentage"
+into walking (matched, required) buckets from best to worst score and
+popping set bits until K jobs are found.
+
+The index is loaded lazily on first use and then maintained incrementally
+from Job signals (see jobs/signals.py). Other processes notice changes
+through a version counter in the default cache and reload when it moves,
+which only works when that cache is shared between processes (see CACHES
+in settings). A copy older than INDEX_MAX_AGE is reloaded regardless, so
+a lost or evicted counter cannot leave a process stale for long.
+"""
+import heapq
+import threading
+import time
+from itertools import groupby
+from operator import itemgetter
+
+from django.core.cache import cache
+
+from .skills import parse_skills, profile_skill_names
+
+
+VERSION_CACHE_KEY = 'jobs:skill_index:version'
+INDEX_MAX_AGE = 60 * 5  # Seconds; also used by the location and typeahead indexes
+
+
+def _positions(bits):
+    """Yield the positions of set bits, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class SkillIndex:
+    """Inverted skill -> job bitset index with top-K match scoring"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._from_database = False
+        self._version = None
+        self._loaded_at = 0.0
+        self._clear()
+
+    def _clear(self):
+        self._postings = {}         # skill name -> bitset of positions
+        self._by_size = {}          # number of skills required -> bitset of positions
+        self._position_of = {}      # job id -> position
+        self._job_at = []           # position -> job id (None when free)
+        self._skills_at = []        # position -> frozenset of skill names
+        self._free = []             # recycled positions
+        self._all = 0               # bitset of occupied positions
+
+    def __len__(self):
+        return len(self._position_of)
+
+    # -- building and maintenance ------------------------------------------
+
+    def build(self, jobs):
+        """Replace the contents with an iterable of (job_id, skill names)"""
+        with self._lock:
+            self._clear()
+            for job_id, names in jobs:
+                self._add(job_id, frozenset(names))
+            self._loaded = True
+            self._from_database = False
+
+    def load(self):
+        """Build the index from all active, verified jobs in the database"""
+        from .models import JobSkill
+
+        rows = (
+            JobSkill.objects
+            .filter(job__is_active=True, job__is_verified=True)
+            .values_list('job_id', 'skill__name')
+            .iterator()
+        )
+        jobs = {}
+        for job_id, name in rows:
+            jobs.setdefault(job_id, set()).add(name)
+        with self._lock:
+            cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+            self._version = cache.get(VERSION_CACHE_KEY)
+            self.build(jobs.items())
+            self._from_database = True
+            self._loaded_at = time.monotonic()
+
+    def _stale(self, version):
+        return not self._loaded or version != self._version or time.monotonic() - self._loaded_at > INDEX_MAX_AGE
+
+    def _ensure_loaded(self):
+        if self._loaded and not self._from_database:
+            return
+        version = cache.get(VERSION_CACHE_KEY)
+        if self._stale(version):
+            with self._lock:
+                if self._stale(version):
+                    self.load()
+
+    def _add(self, job_id, names):
+        if not names:
+            return
+        position = self._free.pop() if self._free else len(self._job_at)
+        if position == len(self._job_at):
+            self._job_at.append(None)
+            self._skills_at.append(frozenset())
+        bit = 1 << position
+        self._job_at[position] = job_id
+        self._skills_at[position] = names
+        self._position_of[job_id] = position
+        self._all |= bit
+        for name in names:
+            self._postings[name] = self._postings.get(name, 0) | bit
+        self._by_size[len(names)] = self._by_size.get(len(names), 0) | bit
+
+    def _remove(self, job_id):
+        position = self._position_of.pop(job_id, None)
+        if position is None:
+            return
+        bit = 1 << position
+        names = self._skills_at[position]
+        for name in names:
+            remaining = self._postings[name] & ~bit
+            if remaining:
+                self._postings[name] = remaining
+            else:
+                del self._postings[name]
+        remaining = self._by_size[len(names)] & ~bit
+        if remaining:
+            self._by_size[len(names)] = remaining
+        else:
+            del self._by_size[len(names)]
+        self._all &= ~bit
+        self._job_at[position] = None
+        self._skills_at[position] = frozenset()
+        self._free.append(position)
+
+    def update_job(self, job):
+        """Reflect a saved job: index it if it is listed, drop it otherwise"""
+        names = frozenset(parse_skills(job.skills_required)) if job.is_active and job.is_verified else None
+        self._apply(lambda: self._set(job.pk, names))
+
+    def remove_job(self, job_id):
+        """Drop a deleted job"""
+        self._apply(lambda: self._remove(job_id))
+
+    def refresh_jobs(self, job_ids):
+        """Re-read jobs changed by queryset.update(), which sends no signals"""
+        from .models import Job
+
+        for job in Job.objects.filter(pk__in=job_ids).only('is_active', 'is_verified', 'skills_required'):
+            self.update_job(job)
+
+    def _set(self, job_id, names):
+        self._remove(job_id)
+        if names:
+            self._add(job_id, names)
+
+    def _apply(self, change):
+        with self._lock:
+            version = _bump_version()
+            if self._loaded and self._from_database:
+                change()
+                # Only claim the new version if no other process changed the
+                # catalogue since we last synced; otherwise reload on next use.
+                if self._version is not None and version == self._version + 1:
+                    self._version = version
+
+    # -- scoring -----------------------------------------------------------
+
+    def _match_counts(self, names):
+        """Bit-sliced per-job counts of how many of `names` each job requires"""
+        planes = []
+        for name in names:
+            carry = self._postings.get(name, 0)
+            level = 0
+            while carry:
+                if level == len(planes):
+                    planes.append(0)
+                plane = planes[level]
+                planes[level] = plane ^ carry
+                carry &= plane
+                level += 1
+        return planes
+
+    def _count_masks(self, planes):
+        """{k: bitset of jobs matching exactly k skills} for k >= 1"""
+        masks = {}
+        for k in range(1, 1 << len(planes)):
+            mask = self._all
+            for level, plane in enumerate(planes):
+                mask &= plane if k >> level & 1 else ~plane
+                if not mask:
+                    break
+            if mask:
+                masks[k] = mask
+        return masks
+
+    def _score_buckets(self, names):
+        """
+        Return [(score, bitset), ...] best score first.
+
+        A bucket holds the jobs requiring `size` skills of which the seeker
+        has exactly `k`, so every job in it has the same score. Callers must
+        hold the lock while expanding bitsets into job ids.
+        """
+        masks = self._count_masks(self._match_counts(frozenset(names)))
+        buckets = []
+        for k, mask in masks.items():
+            for size, jobs_of_size in self._by_size.items():
+                if size >= k:
+                    bits = mask & jobs_of_size
+                    if bits:
+                        buckets.append((round(k / size * 100), bits))
+        buckets.sort(key=itemgetter(0), reverse=True)
+        return buckets
+
+    def score_jobs(self, names):
+        """Return {job_id: match percentage} for every job sharing a skill"""
+        self._ensure_loaded()
+        with self._lock:
+            return {
+                self._job_at[position]: score
+                for score, bits in self._score_buckets(names)
+                for position in _positions(bits)
+            }
+
+    def top_jobs(self, names, k=10, exclude=()):
+        """
+        Return up to k (job_id, score) pairs with the best match, best first.
+
+        Ties are broken by newer job id first. Jobs sharing no skill are not
+        returned, nor are ids in `exclude`. Only the buckets needed to fill
+        k results are expanded into job ids.
+        """
+        self._ensure_loaded()
+        exclude = set(exclude)
+        results = []
+        with self._lock:
+            for score, group in groupby(self._score_buckets(names), key=itemgetter(0)):
+                candidates = [
+                    job_id
+                    for _, bits in group
+                    for job_id in map(self._job_at.__getitem__, _positions(bits))
+                    if job_id not in exclude
+                ]
+                results.extend((job_id, score) for job_id in heapq.nlargest(k - len(results), candidates))
+                if len(results) >= k:
+                    break
+        return results
+
+
+def _bump_version():
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    return cache.incr(VERSION_CACHE_KEY)
+
+
+_index = SkillIndex()
+
+
+def get_skill_index():
+    """The shared, lazily loaded index for this process"""
+    return _index
+
+
+def top_jobs_for_profile(profile, k=10, exclude=()):
+    """Top k (job_id, score) matches for a seeker profile"""
+    return _index.top_jobs(profile_skill_names(profile), k=k, exclude=exclude)
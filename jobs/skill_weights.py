@@ -0,0 +1,157 @@
+"""
+Rarity-weighted (IDF) skill match scoring.
+
+With SKILL_MATCH_WEIGHTING = 'idf' a matched skill counts in proportion to
+how rare it is among listed (active, verified) jobs, so sharing
+"kubernetes" with a job outweighs sharing "communication". The score is
+the weight of the matched skills over the weight of all the job's skills,
+still a 0-100 integer, so templates and the stored
+JobApplication.skill_match_percentage work unchanged.
+
+Document frequencies live on Skill.active_job_count and are adjusted from
+Job signals by the skills entering or leaving the listed set (see
+jobs/signals.py); recount() rebuilds them after bulk updates. Weights are
+cached under a version number bumped on every adjustment.
+
+The displayed and stored percentages are weighted, and so is sort=match
+on the job list (weight_expression() computes the same weights in SQL).
+The skill index and suggested candidates keep counting skills uniformly,
+as SeekerJobMatch.score does.
+"""
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, Ln
+
+
+VERSION_CACHE_KEY = 'jobs:skill_weights:version'
+WEIGHTS_CACHE_TIMEOUT = 60 * 60
+
+_local = (None, None)  # (version, weights) last read by this process
+
+
+def weighting_enabled():
+    return getattr(settings, 'SKILL_MATCH_WEIGHTING', 'uniform') == 'idf'
+
+
+def idf(document_frequency, total_jobs):
+    """Smoothed inverse document frequency; always >= 1"""
+    return math.log((total_jobs + 1) / (document_frequency + 1)) + 1
+
+
+def current_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def get_weights():
+    """Return ({skill name: weight}, weight of a skill no listed job requires)"""
+    global _local
+    from .models import Job, Skill
+
+    version = current_version()
+    if _local[0] == version:
+        return _local[1]
+    key = f'jobs:skill_weights:{version}'
+    weights = cache.get(key)
+    if weights is None:
+        total = Job.objects.filter(is_active=True, is_verified=True).count()
+        weights = (
+            {name: idf(count, total) for name, count in Skill.objects.values_list('name', 'active_job_count')},
+            idf(0, total),
+        )
+        cache.set(key, weights, WEIGHTS_CACHE_TIMEOUT)
+    _local = (version, weights)
+    return weights
+
+
+def weight_expression(frequency):
+    """SQL equivalent of idf() for a document frequency expression, counting listed jobs inline"""
+    from .models import Job
+
+    listed_total = Subquery(
+        Job.objects.filter(is_active=True, is_verified=True)
+        .order_by()
+        .values('is_active')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Ln(
+        Cast(Coalesce(listed_total, Value(0)) + Value(1), FloatField())
+        / Cast(frequency + Value(1), FloatField())
+    ) + Value(1.0)
+
+
+def match_score(job_skills, matched_skills):
+    """
+    Percentage of a job's skills covered by `matched_skills`, 0-100.
+
+    Counts skills uniformly, exactly like Job.calculate_skill_match() always
+    did, unless IDF weighting is enabled.
+    """
+    if not job_skills:
+        return 0
+    if not weighting_enabled():
+        return round(len(matched_skills) / len(job_skills) * 100)
+    weights, unseen = get_weights()
+    total = sum(weights.get(name, unseen) for name in job_skills)
+    matched = sum(weights.get(name, unseen) for name in matched_skills)
+    return round(matched / total * 100)
+
+
+def _bump_version():
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    cache.incr(VERSION_CACHE_KEY)
+
+
+def adjust(entered, left):
+    """Count skill ids newly required by a listed job (`entered`) or no longer (`left`)"""
+    from .models import Skill
+
+    if entered:
+        Skill.objects.filter(pk__in=entered).update(active_job_count=F('active_job_count') + 1)
+    if left:
+        # Clamped, so a drifted count cannot fail the job save; recount() repairs it
+        Skill.objects.filter(pk__in=left).update(active_job_count=Greatest(F('active_job_count') - 1, 0))
+    if entered or left:
+        _bump_version()
+
+
+def job_changed(job, added, removed, was_listed):
+    """
+    Adjust frequencies after a job save.
+
+    `added` / `removed` are the skill ids sync_job_skills() reported and
+    `was_listed` whether the job was active and verified before the save.
+    """
+    from .models import JobSkill
+
+    listed = job.is_active and job.is_verified
+    if not (added or removed or listed != was_listed):
+        return
+    current = set(JobSkill.objects.filter(job=job).values_list('skill_id', flat=True))
+    before = (current - added) | removed if was_listed else set()
+    after = current if listed else set()
+    adjust(after - before, before - after)
+
+
+def recount(skills=None):
+    """Recompute active_job_count for a Skill queryset (all skills by default)"""
+    from .models import JobSkill, Skill
+
+    listed_links = (
+        JobSkill.objects
+        .filter(skill=OuterRef('pk'), job__is_active=True, job__is_verified=True)
+        .values('skill')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    if skills is None:
+        skills = Skill.objects.all()
+    skills.update(active_job_count=Coalesce(Subquery(listed_links), Value(0)))
+    _bump_version()
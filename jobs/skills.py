@@ -0,0 +1,159 @@
+"""
+Skill parsing and the normalized Skill vocabulary.
+
+Jobs and seeker profiles keep their skills as free comma-separated text;
+at write time the text is parsed once into canonical Skill rows linked
+through JobSkill / ProfileSkill (see jobs/signals.py), so matching and
+"jobs requiring X" lookups use indexed joins instead of string work.
+
+Parsing maps aliases to one canonical name ("js" -> "javascript") using
+DEFAULT_SKILL_ALIASES extended by the SKILL_ALIASES setting, and the
+skills text itself is rewritten to canonical names on save. After changing
+the aliases, run the canonicalize_skills command to update existing rows.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+
+
+DEFAULT_SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'ml': 'machine learning',
+    'c sharp': 'c#',
+    'cpp': 'c++',
+    'amazon web services': 'aws',
+    'gcp': 'google cloud',
+}
+
+
+def _clean(raw):
+    return ' '.join(raw.lower().split())
+
+
+@lru_cache(maxsize=None)
+def skill_aliases():
+    """Alias -> canonical name map: the defaults updated with settings.SKILL_ALIASES"""
+    aliases = dict(DEFAULT_SKILL_ALIASES)
+    aliases.update(getattr(settings, 'SKILL_ALIASES', {}))
+    return {_clean(alias): _clean(name) for alias, name in aliases.items()}
+
+
+def canonical_skill(raw):
+    """Lowercase, collapse whitespace and resolve aliases"""
+    name = _clean(raw)
+    return skill_aliases().get(name, name)
+
+
+def parse_skills(text):
+    """Split comma-separated skills into unique canonical names, keeping order"""
+    if not text:
+        return []
+    names = []
+    seen = set()
+    for raw in text.split(','):
+        name = canonical_skill(raw)
+        if name and name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def canonical_skills_text(text):
+    """Skills text rewritten with canonical names, as stored on save"""
+    return ', '.join(parse_skills(text))
+
+
+def job_skill_names(job):
+    """Skill names of a job, using prefetched skill_set rows when available"""
+    prefetched = getattr(job, '_prefetched_objects_cache', {})
+    if 'skill_set' in prefetched:
+        return frozenset(skill.name for skill in prefetched['skill_set'])
+    return _memoized_names(job, job.skills_required)
+
+
+def profile_skills_text(profile):
+    """Skills a seeker entered followed by those detected in their resumes"""
+    return ','.join(text for text in (profile.skills, profile.resume_skills) if text)
+
+
+def profile_skill_names(profile):
+    """Skill names of a seeker profile, parsed once per instance"""
+    return _memoized_names(profile, profile_skills_text(profile))
+
+
+def _memoized_names(instance, text):
+    # The cache is keyed on the raw text so edits to the instance are seen
+    cached = instance.__dict__.get('_skill_names_cache')
+    if cached is None or cached[0] != text:
+        cached = (text, frozenset(parse_skills(text)))
+        instance.__dict__['_skill_names_cache'] = cached
+    return cached[1]
+
+
+def get_or_create_skills(names):
+    """Return {name: Skill} for the given canonical names, creating missing ones"""
+    from .models import Skill
+
+    names = set(names)
+    if not names:
+        return {}
+    skills = {skill.name: skill for skill in Skill.objects.filter(name__in=names)}
+    missing = names - skills.keys()
+    if missing:
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        skills.update((skill.name, skill) for skill in Skill.objects.filter(name__in=missing))
+    return skills
+
+
+def _sync(link_model, owner_field, owner, text):
+    """
+    Make the owner's link rows match the skills in `text`.
+
+    Returns (added_skill_ids, removed_skill_ids) so callers can react to
+    actual changes only.
+    """
+    current = dict(
+        link_model.objects.filter(**{owner_field: owner})
+        .values_list('skill__name', 'skill_id')
+    )
+    wanted = set(parse_skills(text))
+    removed = {skill_id for name, skill_id in current.items() if name not in wanted}
+    missing = wanted - current.keys()
+
+    if removed:
+        link_model.objects.filter(**{owner_field: owner, 'skill_id__in': removed}).delete()
+    added = set()
+    if missing:
+        skills = get_or_create_skills(missing)
+        link_model.objects.bulk_create(
+            [link_model(**{owner_field: owner, 'skill': skill}) for skill in skills.values()],
+            ignore_conflicts=True,
+        )
+        added = {skill.pk for skill in skills.values()}
+    return added, removed
+
+
+def sync_job_skills(job):
+    """Update a job's JobSkill rows from skills_required"""
+    from .models import JobSkill
+    return _sync(JobSkill, 'job', job, job.skills_required)
+
+
+def sync_profile_skills(profile):
+    """Update a profile's ProfileSkill rows from its entered and resume skills"""
+    from .models import ProfileSkill
+    return _sync(ProfileSkill, 'profile', profile, profile_skills_text(profile))
@@ -0,0 +1,74 @@
+"""
+Application status transitions with an audit trail.
+
+Providers move applications through pending -> reviewed -> shortlisted ->
+rejected / hired, one at a time or in bulk from job_applicants. A batch
+runs in one transaction: the rows that actually change are locked and
+read once, updated with a single UPDATE per chunk of ids (restricted to
+the provider's own job, so foreign ids are ignored rather than changed)
+and recorded as ApplicationStatusChange rows, which are only ever added.
+The job's application counters move in the same transaction.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import application_counts
+from .models import ApplicationStatusChange, JobApplication
+
+
+STATUSES = [status for status, _ in JobApplication.STATUS_CHOICES]
+BULK_STATUSES = ['reviewed', 'shortlisted', 'rejected', 'hired']
+# Ids per statement, below SQLite's bound parameter limit
+STATUS_UPDATE_CHUNK_SIZE = 500
+
+
+def parse_ids(values):
+    """Application ids from form values, each a single id or a comma-separated list"""
+    ids = set()
+    for value in values:
+        ids.update(int(part) for part in value.split(',') if part.strip().isdigit())
+    return sorted(ids)
+
+
+def change_status(job, application_ids, status, changed_by):
+    """
+    Move the given applications of `job` to `status` in one transaction.
+
+    Ids of other jobs' applications and applications already in `status`
+    are skipped. Returns the number of applications changed.
+    """
+    if status not in STATUSES:
+        raise ValueError(f'Unknown application status: {status}')
+
+    now = timezone.now()
+    changes = {'status': status}
+    if status != 'pending':
+        changes['reviewed_at'] = now
+
+    changed = 0
+    with transaction.atomic():
+        for start in range(0, len(application_ids), STATUS_UPDATE_CHUNK_SIZE):
+            chunk = application_ids[start:start + STATUS_UPDATE_CHUNK_SIZE]
+            previous = dict(
+                JobApplication.objects
+                .select_for_update()
+                .filter(job=job, pk__in=chunk)
+                .exclude(status=status)
+                .values_list('pk', 'status')
+            )
+            if not previous:
+                continue
+            changed += JobApplication.objects.filter(job=job, pk__in=previous).update(**changes)
+            ApplicationStatusChange.objects.bulk_create([
+                ApplicationStatusChange(
+                    application_id=application_id,
+                    from_status=from_status,
+                    to_status=status,
+                    changed_by=changed_by,
+                )
+                for application_id, from_status in previous.items()
+            ])
+            application_counts.statuses_changed(job.pk, Counter(previous.values()), status)
+    return changed
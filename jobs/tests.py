@@ -1,3 +1,401 @@
-from django.test import TestCase
+import csv
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import Profile
+from hirehub.middleware import QueryBudgetExceeded
+from hirehub.urls import serve_public_media
+
+from . import application_counts, locations, search, skill_index, typeahead
+from .exports import EXPORT_FIELDS, stream_csv
+from .models import (
+    ApplicationStatusChange, Company, Job, JobApplication, JobApplicationCounter, ProfileSkill, ResumeParse,
+    SeekerJobMatch, Skill,
+)
+from .pagination import InvalidCursor, paginate_by_recency
+from .skill_index import get_skill_index
+
+
+def create_profile(username, role, **fields):
+    profile = User.objects.create_user(username, password='pw').profile
+    profile.role = role
+    for name, value in fields.items():
+        setattr(profile, name, value)
+    profile.save()
+    return profile
+
+
+def create_job(provider, company, **fields):
+    fields = {
+        'title': 'Engineer', 'description': 'Build things', 'location': 'Pune', 'salary': '10 LPA',
+        'job_type': 'FT', 'skills_required': 'Python', 'is_verified': True, **fields,
+    }
+    return Job.objects.create(provider=provider, company=company, **fields)
+
+
+
+@override_settings(SQL_PROFILER_ENABLED=True, SQL_PROFILER_STRICT=True)
+class QueryBudgetTests(TestCase):
+    """
+    Hit the budgeted views with several rows on each page, so a per-row
+    query makes SQLProfilerMiddleware raise QueryBudgetExceeded
+    (budgets in SQL_PROFILER_QUERY_BUDGETS).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = create_profile('provider', 'provider')
+
+        companies = [
+            Company.objects.create(name=f'Company {i}', location='Pune', created_by=cls.provider, is_verified=True)
+            for i in range(3)
+        ]
+        skills = ['Python, SQL', 'Django, JavaScript', 'React, CSS, HTML', 'Docker, AWS', 'Python, Docker']
+        cls.jobs = [
+            create_job(
+                cls.provider, companies[i % len(companies)], title=f'Engineer {i}',
+                location=['Bangalore', 'Bengaluru', 'Pune'][i % 3], skills_required=skills[i % len(skills)],
+            )
+            for i in range(12)
+        ]
+
+        cls.seekers = []
+        for i in range(3):
+            profile = create_profile(f'seeker{i}', 'seeker', skills='Python, SQL, docker, React')
+            cls.seekers.append(profile)
+            for job in cls.jobs[i::2]:
+                JobApplication.objects.create(job=job, seeker=profile, resume=f'resumes/seeker{i}.pdf')
+
+    def get(self, username, url_name, *args, **query):
+        self.client.login(username=username, password='pw')
+        response = self.client.get(reverse(url_name, args=args), query)
+        self.assertEqual(response.status_code, 200)
+        # Set by the profiler, so the budget was checked
+        self.assertIn('X-SQL-Query-Count', response)
+        return response
+
+    def test_over_budget_raises(self):
+        with self.settings(SQL_PROFILER_QUERY_BUDGETS={'job_list': 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.get('seeker0', 'job_list')
+
+    def test_job_list(self):
+        self.get('seeker0', 'job_list')
+        self.get('seeker0', 'job_list', sort='match')
+        self.get('seeker0', 'job_list', skill='python', location='bangalore')
+
+    def test_job_list_anonymous(self):
+        response = self.client.get(reverse('job_list'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_job_detail(self):
+        self.get('seeker0', 'job_detail', self.jobs[0].pk)
+        self.get('seeker1', 'job_detail', self.jobs[0].pk)
+        self.get('provider', 'job_detail', self.jobs[0].pk)
+
+    def test_seeker_dashboard(self):
+        self.get('seeker0', 'seeker_dashboard')
+
+    def test_provider_dashboard(self):
+        response = self.get('provider', 'provider_dashboard')
+        self.assertEqual(response.context['total_applications'], JobApplication.objects.count())
+
+
+class JobAdminActionTests(TestCase):
+    """Admin verify/unverify actions refresh the derived job data"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        provider = create_profile('provider', 'provider')
+        company = Company.objects.create(name='Company', location='Pune', created_by=provider, is_verified=True)
+        cls.jobs = [
+            create_job(provider, company, title=f'Engineer {i}', skills_required='Python, Rust', is_verified=False)
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        get_skill_index().load()
+        self.client.force_login(self.admin)
+
+    def run_action(self, action, query):
+        # Submitted from a filtered changelist, as an admin usually does
+        response = self.client.post(
+            reverse('admin:jobs_job_changelist') + query,
+            {'action': action, '_selected_action': [job.pk for job in self.jobs]},
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def test_verify_from_filtered_changelist(self):
+        self.run_action('verify_jobs', '?is_verified__exact=0')
+
+        self.assertEqual(Job.objects.filter(is_verified=True).count(), 3)
+        self.assertEqual(Skill.objects.get(name='rust').active_job_count, 3)
+        top = get_skill_index().top_jobs(['python', 'rust'], k=10)
+        self.assertEqual({job_id for job_id, _ in top}, {job.pk for job in self.jobs})
+
+    def test_unverify_from_filtered_changelist(self):
+        self.run_action('verify_jobs', '?is_verified__exact=0')
+        self.run_action('unverify_jobs', '?is_verified__exact=1')
+
+        self.assertEqual(Job.objects.filter(is_verified=True).count(), 0)
+        self.assertEqual(Skill.objects.get(name='rust').active_job_count, 0)
+        self.assertEqual(get_skill_index().top_jobs(['python', 'rust'], k=10), [])
+
+
+class JobMatchRefreshTests(TestCase):
+    """Stored matches follow a job's skills, written after the edit commits"""
+
+    @classmethod
+    def setUpTestData(cls):
+        provider = create_profile('provider', 'provider')
+        cls.seeker = create_profile('seeker', 'seeker', skills='Python, SQL')
+        company = Company.objects.create(name='Company', location='Pune', created_by=provider, is_verified=True)
+        cls.job = create_job(provider, company, skills_required='Python, Rust')
+
+    def test_skills_edit_refreshes_after_commit(self):
+        self.job.skills_required = 'Python, SQL'
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.job.save()
+        self.assertEqual(len(callbacks), 1)
+        match = SeekerJobMatch.objects.get(job=self.job, seeker=self.seeker)
+        self.assertEqual((match.score, match.matched_skills), (100, 'python,sql'))
+
+    def test_other_edits_leave_matches_alone(self):
+        self.job.title = 'Senior Engineer'
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.job.save()
+        self.assertEqual(callbacks, [])
+
+
+class JobIndexVersionTests(TestCase):
+    """Only edits to indexed fields make other processes reload their indexes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        provider = create_profile('provider', 'provider')
+        company = Company.objects.create(name='Company', location='Pune', created_by=provider, is_verified=True)
+        cls.job = create_job(provider, company)
+
+    def versions(self):
+        return cache.get_many([skill_index.VERSION_CACHE_KEY, locations.VERSION_CACHE_KEY, typeahead.VERSION_CACHE_KEY])
+
+    def test_unindexed_edit_keeps_versions(self):
+        before = self.versions()
+        self.job.description = 'Build other things'
+        self.job.salary = '12 LPA'
+        self.job.save()
+        self.assertEqual(self.versions(), before)
+
+    def test_indexed_edit_bumps_versions(self):
+        before = self.versions()
+        self.job.is_active = False
+        self.job.save()
+        after = self.versions()
+        for key, version in before.items():
+            self.assertGreater(after[key], version)
+
+
+class ApplicantExportTests(SimpleTestCase):
+    def test_csv_escapes_formulas(self):
+        row = dict.fromkeys(EXPORT_FIELDS, '')
+        row.update(username='=HYPERLINK("http://x")', name='+1', phone='-2', email='@a', status='pending')
+        lines = ''.join(stream_csv([row])).splitlines()
+        values = next(csv.DictReader(lines))
+        self.assertEqual(values['username'], '\'=HYPERLINK("http://x")')
+        self.assertEqual([values['name'], values['phone'], values['email']], ["'+1", "'-2", "'@a"])
+        self.assertEqual(values['status'], 'pending')
+
+
+class ProfileSaveTests(TestCase):
+    """User saves, such as the last_login update on each login, re-save the profile"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('seeker', password='pw')
+        profile = cls.user.profile
+        profile.role = 'seeker'
+        profile.skills = 'Python, SQL'
+        profile.resume = 'resumes/ab/resume.pdf'
+        profile.save()
+
+    def test_login_skips_skill_and_resume_work(self):
+        ResumeParse.objects.all().delete()
+        # The user update, the profile's stored state and the profile update
+        with self.assertNumQueries(3):
+            self.user.save()
+        self.client.login(username='seeker', password='pw')
+        self.assertFalse(ResumeParse.objects.exists())
+
+    def test_skill_edit_syncs(self):
+        profile = Profile.objects.get(user=self.user)
+        profile.skills = 'Python, Rust'
+        profile.save()
+        names = set(ProfileSkill.objects.filter(profile=profile).values_list('skill__name', flat=True))
+        self.assertEqual(names, {'python', 'rust'})
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        provider = create_profile('provider', 'provider')
+        company = Company.objects.create(name='Company', location='Pune', created_by=provider, is_verified=True)
+        cls.jobs = [create_job(provider, company, title=f'Engineer {i}') for i in range(7)]
+        # Ties on created_at are broken by id
+        Job.objects.filter(pk__in=[job.pk for job in cls.jobs[2:5]]).update(created_at=cls.jobs[2].created_at)
+
+    def test_pages_cover_every_job_once(self):
+        seen, cursor = [], None
+        while True:
+            page = paginate_by_recency(Job.objects.all(), cursor, page_size=3)
+            seen.extend(job.pk for job in page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        expected = Job.objects.order_by('-created_at', '-id').values_list('pk', flat=True)
+        self.assertEqual(seen, list(expected))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            paginate_by_recency(Job.objects.all(), 'not-a-cursor')
+        response = self.client.get(reverse('job_list'), {'cursor': 'not-a-cursor'})
+        self.assertRedirects(response, reverse('job_list'))
+
+
+class JobSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        provider = create_profile('provider', 'provider')
+        company = Company.objects.create(name='Acme', location='Pune', created_by=provider, is_verified=True)
+        cls.django_job = create_job(provider, company, title='Django Developer', skills_required='Python, Django')
+        cls.react_job = create_job(provider, company, title='Frontend Engineer', skills_required='React')
+
+    def test_prefix_terms_match(self):
+        self.assertEqual(set(search.ranked_matches('djan dev')), {self.django_job.pk})
+
+    def test_edits_reach_the_index(self):
+        self.react_job.title = 'Django Reviewer'
+        self.react_job.save()
+        self.assertEqual(set(search.ranked_matches('django')), {self.django_job.pk, self.react_job.pk})
+        self.react_job.delete()
+        self.assertEqual(set(search.ranked_matches('django')), {self.django_job.pk})
+
+
+class ApplicationStatusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = create_profile('provider', 'provider')
+        company = Company.objects.create(name='Company', location='Pune', created_by=cls.provider, is_verified=True)
+        cls.job = create_job(cls.provider, company)
+        cls.other_job = create_job(cls.provider, company, title='Other')
+        cls.applications = [
+            JobApplication.objects.create(job=cls.job, seeker=create_profile(f'seeker{i}', 'seeker'), resume='resumes/cv.pdf')
+            for i in range(3)
+        ]
+        cls.other_application = JobApplication.objects.create(
+            job=cls.other_job, seeker=cls.applications[0].seeker, resume='resumes/cv.pdf',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.provider.user)
+
+    def counter(self, job):
+        return JobApplicationCounter.objects.get(job=job)
+
+    def test_bulk_change_updates_counters_and_history(self):
+        ids = [self.applications[0].pk, self.applications[1].pk, self.other_application.pk]
+        response = self.client.post(
+            reverse('bulk_update_application_status', args=[self.job.pk]),
+            {'status': 'shortlisted', 'application_ids': ','.join(map(str, ids))},
+        )
+        self.assertRedirects(response, reverse('job_applicants', args=[self.job.pk]))
+
+        counter = self.counter(self.job)
+        self.assertEqual((counter.total, counter.pending, counter.shortlisted), (3, 1, 2))
+        # Another job's application is not touched
+        self.assertEqual(JobApplication.objects.get(pk=self.other_application.pk).status, 'pending')
+        self.assertEqual(ApplicationStatusChange.objects.filter(to_status='shortlisted').count(), 2)
+
+    def test_single_change_is_post_only(self):
+        url = reverse('update_application_status', args=[self.applications[0].pk, 'rejected'])
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.client.post(url)
+        self.assertEqual(JobApplication.objects.get(pk=self.applications[0].pk).status, 'rejected')
+        self.assertEqual(self.counter(self.job).rejected, 1)
+
+    def test_counters_follow_saves_and_deletes(self):
+        application = self.applications[2]
+        application.status = 'hired'
+        application.save()
+        application = JobApplication.objects.get(pk=self.applications[1].pk)
+        application.delete()
+        counter = self.counter(self.job)
+        self.assertEqual((counter.total, counter.pending, counter.hired), (2, 1, 1))
+        self.assertEqual(application_counts.reconcile(), 0)
+
+
+class ResumeAccessTests(TestCase):
+    """Resumes go out only through download_resume, to the seeker, providers applied to and staff"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root)
+        with override_settings(MEDIA_ROOT=cls.media_root):
+            cls.seeker = create_profile('seeker', 'seeker')
+            cls.seeker.resume.save('cv.pdf', ContentFile(b'%PDF-1.4 resume'))
+        cls.name = cls.seeker.resume.name
+
+        provider = create_profile('provider', 'provider')
+        company = Company.objects.create(name='Company', location='Pune', created_by=provider, is_verified=True)
+        JobApplication.objects.create(job=create_job(provider, company), seeker=cls.seeker, resume=cls.name)
+        create_profile('other_provider', 'provider')
+        create_profile('other_seeker', 'seeker')
+        User.objects.create_user('staff', password='pw', is_staff=True)
+
+    def setUp(self):
+        overrider = override_settings(MEDIA_ROOT=self.media_root)
+        overrider.enable()
+        self.addCleanup(overrider.disable)
+        self.url = reverse('download_resume', args=[self.name])
+
+    def download(self, username, **headers):
+        self.client.login(username=username, password='pw')
+        return self.client.get(self.url, headers=headers)
+
+    def test_allowed(self):
+        for username in ('seeker', 'provider', 'staff'):
+            with self.subTest(username=username):
+                response = self.download(username)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 resume')
+
+    def test_denied(self):
+        for username in ('other_provider', 'other_seeker'):
+            with self.subTest(username=username):
+                self.assertEqual(self.download(username).status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_range_and_conditional_requests(self):
+        response = self.download('seeker', range='bytes=0-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 0-3/15')
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF')
+
+        etag = self.download('seeker')['ETag']
+        self.assertEqual(self.download('seeker', if_none_match=etag).status_code, 304)
+        self.assertEqual(self.download('seeker', range='bytes=99-').status_code, 416)
+
+    def test_debug_media_route_refuses_resumes(self):
+        request = RequestFactory().get('/')
+        for path in (self.name, '/' + self.name, 'logos/../' + self.name):
+            with self.subTest(path=path), self.assertRaises(Http404):
+                serve_public_media(request, path)
@@ -0,0 +1,123 @@
+"""
+Prefix trie with cached top completions for autocomplete endpoints.
+
+Every node keeps the best `limit` (weight, key, item) entries of its
+subtree, refreshed bottom-up along the path of each insert or removal, so
+answering a prefix query costs only the walk down the prefix regardless of
+how many entries share it. Items must be hashable and orderable.
+"""
+
+
+class _Node:
+    __slots__ = ('children', 'items', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.items = {}     # item -> weight, for entries whose key ends here
+        self.top = []       # best entries of the subtree, best first
+
+
+def _rank(entry):
+    weight, key, item = entry
+    return (-weight, key, item)
+
+
+class PrefixTrie:
+    """Map normalized keys to weighted items and complete prefixes"""
+
+    def __init__(self, limit=10):
+        self.limit = limit
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _path(self, key, create=False):
+        nodes = [self._root]
+        for char in key:
+            node = nodes[-1].children.get(char)
+            if node is None:
+                if not create:
+                    return None
+                node = nodes[-1].children[char] = _Node()
+            nodes.append(node)
+        return nodes
+
+    def _refresh(self, nodes, key):
+        # Recompute cached tops bottom-up, pruning nodes left empty
+        for depth in range(len(nodes) - 1, -1, -1):
+            node = nodes[depth]
+            self._update_top(node, key[:depth])
+            if depth and not node.top and not node.children:
+                del nodes[depth - 1].children[key[depth - 1]]
+
+    def _update_top(self, node, node_key):
+        if not node.items and len(node.children) == 1:
+            # Inner node of a single-child chain: share the child's list
+            node.top = next(iter(node.children.values())).top
+            return
+        candidates = [(weight, node_key, item) for item, weight in node.items.items()]
+        for child in node.children.values():
+            candidates.extend(child.top)
+        node.top = self._best(candidates)
+
+    def _best(self, candidates):
+        # An item reachable through several keys (e.g. aliases) is listed once
+        top = []
+        seen = set()
+        for entry in sorted(candidates, key=_rank):
+            if entry[2] not in seen:
+                seen.add(entry[2])
+                top.append(entry)
+                if len(top) == self.limit:
+                    break
+        return top
+
+    def build(self, entries):
+        """Replace the contents with (key, item, weight) entries in one pass"""
+        self._root = _Node()
+        self._size = 0
+        for key, item, weight in entries:
+            node = self._root
+            for char in key:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _Node()
+                node = child
+            if item not in node.items:
+                self._size += 1
+            node.items[item] = weight
+        # Post-order so every child's top is ready before its parent's
+        stack = [(self._root, '', False)]
+        while stack:
+            node, key, expanded = stack.pop()
+            if expanded:
+                self._update_top(node, key)
+            else:
+                stack.append((node, key, True))
+                stack.extend((child, key + char, False) for char, child in node.children.items())
+
+    def add(self, key, item, weight=1):
+        """Insert or re-weight `item` under `key`"""
+        nodes = self._path(key, create=True)
+        if item not in nodes[-1].items:
+            self._size += 1
+        nodes[-1].items[item] = weight
+        self._refresh(nodes, key)
+
+    def discard(self, key, item):
+        """Remove `item` from `key` if present"""
+        nodes = self._path(key)
+        if nodes is None or item not in nodes[-1].items:
+            return
+        del nodes[-1].items[item]
+        self._size -= 1
+        self._refresh(nodes, key)
+
+    def complete(self, prefix, limit=None):
+        """Return up to `limit` (item, weight) pairs whose key starts with `prefix`, best first"""
+        nodes = self._path(prefix)
+        if nodes is None:
+            return []
+        return [(item, weight) for weight, _, item in nodes[-1].top[:limit or self.limit]]
@@ -0,0 +1,214 @@
+"""
+Typeahead suggestions for the job search box.
+
+Job titles, skills and company names of listed (active, verified) jobs
+are kept in one prefix trie per kind, weighted by how many listed jobs
+carry them. Every word start is a key, so "dev" suggests "Python
+Developer" as well as "DevOps". Answering a prefix only walks the prefix
+in the trie, which keeps requests well under a millisecond regardless of
+catalogue size.
+
+Responses for anonymous visitors are also cached under the index version
+(see cached_suggestions()), so identical prefixes are served from the
+cache by any process.
+
+Like the skill index, the index loads lazily, is updated incrementally
+from Job and Company signals (see jobs/signals.py) and reloads when the
+version counter in the shared cache shows another process changed it, or
+once it is older than INDEX_MAX_AGE.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache
+
+from .skill_index import INDEX_MAX_AGE
+from .skills import parse_skills
+from .trie import PrefixTrie
+
+
+VERSION_CACHE_KEY = 'jobs:typeahead:version'
+SUGGESTION_KINDS = ('title', 'skill', 'company')
+SUGGESTIONS_PER_KIND = 5
+SUGGESTION_CACHE_TIMEOUT = 60 * 5
+
+
+def normalize(text):
+    """Lowercase and collapse whitespace"""
+    return ' '.join((text or '').lower().split())
+
+
+def _word_keys(label):
+    # "senior python developer" -> itself, "python developer", "developer"
+    words = normalize(label).split()
+    return [' '.join(words[start:]) for start in range(len(words))]
+
+
+def _job_items(title, company_name, skills):
+    items = {('title', ' '.join(title.split()))}
+    items.update(('skill', name) for name in skills)
+    if company_name:
+        items.add(('company', ' '.join(company_name.split())))
+    return items
+
+
+class TypeaheadIndex:
+    """Weighted prefix suggestions over titles, skills and companies"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._version = None
+        self._loaded_at = 0.0
+        self._clear()
+
+    def _clear(self):
+        self._tries = {kind: PrefixTrie(limit=SUGGESTIONS_PER_KIND) for kind in SUGGESTION_KINDS}
+        self._counts = Counter()    # (kind, normalized label) -> listed jobs
+        self._labels = {}           # (kind, normalized label) -> display label
+        self._items_of = {}         # job id -> its (kind, label) items
+
+    # -- building and maintenance ------------------------------------------
+
+    def load(self):
+        """Build the index from all active, verified jobs in the database"""
+        from .models import Job
+
+        with self._lock:
+            cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+            self._version = cache.get(VERSION_CACHE_KEY)
+            self._clear()
+            rows = (
+                Job.objects
+                .filter(is_active=True, is_verified=True)
+                .values_list('id', 'title', 'company__name', 'skills_required')
+                .iterator()
+            )
+            for job_id, title, company_name, skills_required in rows:
+                items = _job_items(title, company_name, parse_skills(skills_required))
+                self._items_of[job_id] = items
+                for kind, label in items:
+                    item = (kind, normalize(label))
+                    self._counts[item] += 1
+                    self._labels.setdefault(item, label)
+            for kind, trie in self._tries.items():
+                trie.build(
+                    (key, item, count)
+                    for item, count in self._counts.items() if item[0] == kind
+                    for key in _word_keys(self._labels[item])
+                )
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+
+    def _stale(self, version):
+        return not self._loaded or version != self._version or time.monotonic() - self._loaded_at > INDEX_MAX_AGE
+
+    def _ensure_loaded(self):
+        version = cache.get(VERSION_CACHE_KEY)
+        if self._stale(version):
+            with self._lock:
+                if self._stale(version):
+                    self.load()
+
+    def _adjust(self, item, label, delta):
+        kind, _ = item
+        count = self._counts[item] + delta
+        trie = self._tries[kind]
+        if count > 0:
+            self._counts[item] = count
+            self._labels.setdefault(item, label)
+            for key in _word_keys(label):
+                trie.add(key, item, weight=count)
+        else:
+            del self._counts[item]
+            for key in _word_keys(self._labels.pop(item, label)):
+                trie.discard(key, item)
+
+    def _set(self, job_id, items):
+        old = self._items_of.pop(job_id, set())
+        for kind, label in old - items:
+            self._adjust((kind, normalize(label)), label, -1)
+        for kind, label in items - old:
+            self._adjust((kind, normalize(label)), label, 1)
+        if items:
+            self._items_of[job_id] = items
+
+    def update_job(self, job):
+        """Reflect a saved job: index it if it is listed, drop it otherwise"""
+        items = set()
+        if job.is_active and job.is_verified:
+            items = _job_items(job.title, job.company.name, parse_skills(job.skills_required))
+        self._apply(lambda: self._set(job.pk, items))
+
+    def remove_job(self, job_id):
+        """Drop a deleted job"""
+        self._apply(lambda: self._set(job_id, set()))
+
+    def refresh_jobs(self, jobs):
+        """Re-read jobs changed without signals, or whose company was renamed"""
+        for job in jobs.select_related('company').only(
+            'is_active', 'is_verified', 'title', 'skills_required', 'company__name'
+        ):
+            self.update_job(job)
+
+    def _apply(self, change):
+        with self._lock:
+            version = _bump_version()
+            if self._loaded:
+                change()
+                # Same protocol as the skill index: keep our copy only if no
+                # other process changed the catalogue since we last synced.
+                if self._version is not None and version == self._version + 1:
+                    self._version = version
+
+    # -- querying ----------------------------------------------------------
+
+    @property
+    def version(self):
+        self._ensure_loaded()
+        return self._version
+
+    def suggest(self, prefix, limit=SUGGESTIONS_PER_KIND):
+        """
+        Return suggestions for `prefix`, titles first, then skills and companies.
+
+        [{'type', 'name', 'count'}], at most `limit` per kind, most listed
+        jobs first within each kind.
+        """
+        key = normalize(prefix)
+        if not key:
+            return []
+        self._ensure_loaded()
+        with self._lock:
+            return [
+                {'type': kind, 'name': self._labels[item], 'count': count}
+                for kind in SUGGESTION_KINDS
+                for item, count in self._tries[kind].complete(key, limit)
+            ]
+
+
+def _bump_version():
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    return cache.incr(VERSION_CACHE_KEY)
+
+
+_index = TypeaheadIndex()
+
+
+def get_typeahead_index():
+    """The shared, lazily loaded index for this process"""
+    return _index
+
+
+def cached_suggestions(prefix):
+    """suggest() through the shared cache, keyed by index version and prefix"""
+    key = normalize(prefix)
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    cache_key = f'jobs:typeahead:{_index.version}:{digest}'
+    suggestions = cache.get(cache_key)
+    if suggestions is None:
+        suggestions = _index.suggest(key)
+        cache.set(cache_key, suggestions, SUGGESTION_CACHE_TIMEOUT)
+    return suggestions
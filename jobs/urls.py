@@ -7,6 +7,8 @@ urlpatterns = [
     path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
     path('companies/', views.company_list, name='company_list'),
     path('companies/<int:company_id>/', views.company_detail, name='company_detail'),
+    path('api/locations/', views.location_autocomplete, name='location_autocomplete'),
+    path('api/search-suggestions/', views.search_suggestions, name='search_suggestions'),
     
     # Job Seeker views
     path('jobs/<int:job_id>/apply/', views.apply_job, name='apply_job'),
@@ -20,6 +22,10 @@ urlpatterns = [
     path('provider/jobs/<int:job_id>/edit/', views.edit_job, name='edit_job'),
     path('provider/jobs/<int:job_id>/delete/', views.delete_job, name='delete_job'),
     path('provider/jobs/<int:job_id>/applicants/', views.job_applicants, name='job_applicants'),
+    path('provider/jobs/<int:job_id>/applicants/export/', views.export_applicants, name='export_applicants'),
+    path('provider/jobs/<int:job_id>/applicants/status/', views.bulk_update_application_status, name='bulk_update_application_status'),
+    path('provider/jobs/<int:job_id>/candidates/', views.suggested_candidates, name='suggested_candidates'),
     path('provider/applications/<int:application_id>/<str:status>/', views.update_application_status, name='update_application_status'),
+    path('files/<path:name>', views.download_resume, name='download_resume'),
 ]
 
@@ -2,94 +2,153 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Q
-from django.utils import timezone
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import urlencode
+from django.views.decorators.http import require_POST
 
+from . import exports, facets, match_store, resume_delivery, search, status_changes
+from .duplicates import find_duplicates
+from .locations import get_location_directory
+from .match_results import match_result, match_results
+from .similar_jobs import similar_jobs
+from .skills import canonical_skill
+from .typeahead import cached_suggestions, get_typeahead_index
 from .models import Job, JobApplication, Company, JobReport
 from .forms import JobForm, JobApplicationForm, JobReportForm
+from .matching import annotate_skill_match
+from .pagination import InvalidCursor, paginate_by_annotation, paginate_by_match, paginate_by_recency, paginate_by_score
 from accounts.decorators import seeker_required, provider_required
 from accounts.models import Profile
 
 
 def job_list(request):
     """List all verified jobs with filtering and skill matching"""
-    jobs = Job.objects.filter(is_verified=True, is_active=True).order_by('-created_at')
-    
-    # Filter by company
-    company_id = request.GET.get('company')
-    if company_id:
-        jobs = jobs.filter(company_id=company_id)
-    
-    # Filter by job type
-    job_type = request.GET.get('job_type')
-    if job_type:
-        jobs = jobs.filter(job_type=job_type)
-    
-    # Filter by location
-    location = request.GET.get('location')
-    if location:
-        jobs = jobs.filter(location__icontains=location)
-    
-    # Search functionality
-    search_query = request.GET.get('search')
-    if search_query:
-        jobs = jobs.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(skills_required__icontains=search_query) |
-            Q(company__name__icontains=search_query)
-        )
+    filters = {
+        'company': request.GET.get('company'),
+        'job_type': request.GET.get('job_type'),
+        'location': request.GET.get('location'),
+        # Skills are stored canonical (lowercased, aliases resolved) in the Skill table
+        'skill': canonical_skill(request.GET.get('skill', '')),
+        'search': request.GET.get('search'),
+    }
+    jobs = facets.apply_filters(facets.listed_jobs(), filters)
+    search_query = filters['search']
     
     # Calculate skill match for authenticated job seekers
-    jobs_with_match = []
     user_profile = None
     if request.user.is_authenticated and hasattr(request.user, 'profile'):
         if request.user.profile.role == 'seeker':
             user_profile = request.user.profile
     
-    for job in jobs:
+    # Keyset pagination: only one page of jobs is loaded per request
+    sort = request.GET.get('sort') if user_profile else None
+    cursor = request.GET.get('cursor')
+    scored_keys = None
+    if search_query and search.is_available() and sort != 'match':
+        # Rank search results by BM25 relevance
+        relevance = search.ranked_matches(search_query)
+        scored_keys = (
+            (relevance.get(pk, 0.0), created_at, pk)
+            for pk, created_at in jobs.values_list('id', 'created_at')
+        )
+    
+    try:
+        if scored_keys is not None:
+            page = paginate_by_score(scored_keys, cursor)
+            page_jobs = jobs.select_related('company').in_bulk([pk for _, _, pk in page])
+            page_jobs = [page_jobs[pk] for _, _, pk in page]
+        elif sort == 'match':
+            # Scored, ordered and limited in SQL; only the page reaches Python
+            scored_jobs = annotate_skill_match(jobs, user_profile)
+            page = paginate_by_annotation(
+                scored_jobs.select_related('company'), 'skill_match', cursor
+            )
+            page_jobs = page.items
+        else:
+            page = paginate_by_recency(jobs.select_related('company'), cursor)
+            page_jobs = page.items
+    except InvalidCursor:
+        return redirect('job_list')
+    
+    # Match results for the visible page, one cache round trip
+    page_matches = match_results(user_profile, page_jobs) if user_profile else {}
+    
+    jobs_with_match = []
+    for job in page_jobs:
+        match = page_matches.get(job.id)
         job_data = {
             'job': job,
-            'skill_match': job.calculate_skill_match(user_profile) if user_profile else None,
-            'matching_skills': job.get_matching_skills(user_profile) if user_profile else []
+            'skill_match': match.score if match else None,
+            'matching_skills': match.matched if match else [],
         }
         jobs_with_match.append(job_data)
     
-    # Sort by skill match if user is a seeker
-    if user_profile and request.GET.get('sort') == 'match':
-        jobs_with_match.sort(key=lambda x: x['skill_match'] or 0, reverse=True)
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    if filters['skill']:
+        # Page links carry the canonical name, e.g. ?skill=js -> ?skill=javascript
+        params['skill'] = filters['skill']
+    first_page_query = params.urlencode()
+    next_page_query = None
+    if page.has_next:
+        params['cursor'] = page.next_cursor
+        next_page_query = params.urlencode()
     
-    companies = Company.objects.all().order_by('name')
-    locations = Job.objects.filter(is_verified=True).values_list('location', flat=True).distinct()
+    # Cached, counted sidebar facets
+    facet_counts = facets.job_facets(filters)
     
     return render(request, 'jobs/job_list.html', {
         'jobs_with_match': jobs_with_match,
-        'companies': companies,
-        'locations': locations,
-        'selected_company': company_id,
-        'selected_job_type': job_type,
-        'selected_location': location,
+        'companies': facet_counts['companies'],
+        'locations': facet_counts['locations'],
+        'selected_company': filters['company'],
+        'selected_job_type': filters['job_type'],
+        'selected_location': filters['location'],
+        'selected_skill': filters['skill'],
         'search_query': search_query,
-        'job_types': Job.JOB_TYPE_CHOICES,
+        'job_types': facet_counts['job_types'],
         'user_profile': user_profile,
+        'sort': sort,
+        'is_first_page': not cursor,
+        'first_page_query': first_page_query,
+        'next_page_query': next_page_query,
     })
 
 
+def location_autocomplete(request):
+    """JSON location suggestions for a typed prefix, busiest locations first"""
+    suggestions = get_location_directory().complete(request.GET.get('q', ''))
+    return JsonResponse({'results': suggestions})
+
+
+def search_suggestions(request):
+    """JSON typeahead for the job search box: titles, skills and companies"""
+    prefix = request.GET.get('q', '')
+    if request.user.is_authenticated:
+        suggestions = get_typeahead_index().suggest(prefix)
+    else:
+        suggestions = cached_suggestions(prefix)
+    response = JsonResponse({'results': suggestions})
+    if not request.user.is_authenticated:
+        patch_cache_control(response, public=True, max_age=60)
+    return response
+
+
 def job_detail(request, job_id):
     """View job details with skill matching"""
     job = get_object_or_404(Job, pk=job_id, is_verified=True)
     
     # Check if user has already applied
     has_applied = False
-    skill_match = None
-    matching_skills = []
+    match = None
     has_reported = False
     
     if request.user.is_authenticated and hasattr(request.user, 'profile'):
         profile = request.user.profile
         if profile.role == 'seeker':
             has_applied = JobApplication.objects.filter(job=job, seeker=profile).exists()
-            skill_match = job.calculate_skill_match(profile)
-            matching_skills = job.get_matching_skills(profile)
+            match = match_result(profile, job)
         
         # Check if user has already reported this job
         has_reported = JobReport.objects.filter(job=job, reported_by=profile).exists()
@@ -100,10 +159,12 @@ def job_detail(request, job_id):
     return render(request, 'jobs/job_detail.html', {
         'job': job,
         'has_applied': has_applied,
-        'skill_match': skill_match,
-        'matching_skills': matching_skills,
+        'skill_match': match.score if match else None,
+        'matching_skills': match.matched if match else [],
+        'missing_skills': match.missing if match else [],
         'has_reported': has_reported,
         'report_count': report_count,
+        'similar_jobs': similar_jobs(job),
     })
 
 
@@ -118,9 +179,8 @@ def apply_job(request, job_id):
         messages.warning(request, 'You have already applied for this job.')
         return redirect('job_detail', job_id=job_id)
     
-    # Calculate skill match
-    skill_match = job.calculate_skill_match(profile)
-    matching_skills = job.get_matching_skills(profile)
+    match = match_result(profile, job)
+    skill_match = match.score
     
     if request.method == 'POST':
         form = JobApplicationForm(request.POST, request.FILES)
@@ -139,7 +199,7 @@ def apply_job(request, job_id):
         'form': form, 
         'job': job,
         'skill_match': skill_match,
-        'matching_skills': matching_skills,
+        'matching_skills': match.matched,
     })
 
 
@@ -150,6 +210,14 @@ def application_status(request, application_id):
     return render(request, 'jobs/application_status.html', {'application': application})
 
 
+@login_required
+def download_resume(request, name):
+    """Serve a stored resume to its seeker, the providers it was sent to, or staff"""
+    if not resume_delivery.can_download(request.user, name):
+        raise Http404('Resume not found')
+    return resume_delivery.serve(request, name)
+
+
 @provider_required
 def create_job(request):
     """Create a new job post"""
@@ -164,6 +232,12 @@ def create_job(request):
         if form.is_valid():
             job = form.save(commit=False)
             job.provider = profile
+            # Reposting the same role needs an explicit confirmation
+            duplicates = []
+            if not request.POST.get('confirm_duplicate'):
+                duplicates = find_duplicates(job.title, job.description, profile.pk, job.company_id)
+            if duplicates:
+                return render(request, 'jobs/create_job.html', {'form': form, 'duplicates': duplicates})
             job.save()
             messages.success(request, 'Job posted successfully! It will be visible after admin verification.')
             return redirect('provider_dashboard')
@@ -217,7 +291,7 @@ def job_applicants(request, job_id):
     status_filter = request.GET.get('status')
     sort_by = request.GET.get('sort', '-applied_at')
     
-    applications = JobApplication.objects.filter(job=job)
+    applications = JobApplication.objects.filter(job=job).select_related('seeker__user')
     
     if status_filter:
         applications = applications.filter(status=status_filter)
@@ -239,6 +313,46 @@ def job_applicants(request, job_id):
 
 
 @provider_required
+def export_applicants(request, job_id):
+    """Stream a job's applicants as CSV or NDJSON (?format=ndjson)"""
+    job = get_object_or_404(Job, pk=job_id, provider=request.user.profile)
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in exports.EXPORT_FORMATS:
+        export_format = 'csv'
+    
+    applications = JobApplication.objects.filter(job=job)
+    status_filter = request.GET.get('status')
+    if status_filter:
+        applications = applications.filter(status=status_filter)
+    
+    rows = exports.applicant_rows(applications, request)
+    response = StreamingHttpResponse(
+        exports.STREAMS[export_format](rows), content_type=exports.EXPORT_FORMATS[export_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="job-{job.pk}-applicants.{export_format}"'
+    return response
+
+
+@provider_required
+def suggested_candidates(request, job_id):
+    """Rank seekers who have not applied yet by skill match with a job"""
+    job = get_object_or_404(Job.objects.select_related('company'), pk=job_id, provider=request.user.profile)
+    cursor = request.GET.get('cursor')
+    try:
+        page = paginate_by_match(match_store.candidates_for_job(job), cursor)
+    except InvalidCursor:
+        return redirect('suggested_candidates', job_id=job_id)
+    
+    return render(request, 'jobs/suggested_candidates.html', {
+        'job': job,
+        'candidates': page.items,
+        'is_first_page': not cursor,
+        'next_cursor': page.next_cursor,
+    })
+
+
+@provider_required
+@require_POST
 def update_application_status(request, application_id, status):
     """Update application status"""
     application = get_object_or_404(JobApplication, pk=application_id)
@@ -248,17 +362,38 @@ def update_application_status(request, application_id, status):
         messages.error(request, 'Unauthorized access.')
         return redirect('provider_dashboard')
     
-    valid_statuses = ['pending', 'reviewed', 'shortlisted', 'rejected', 'hired']
-    if status in valid_statuses:
-        application.status = status
-        if status != 'pending':
-            application.reviewed_at = timezone.now()
-        application.save()
+    if status in status_changes.STATUSES:
+        status_changes.change_status(application.job, [application.pk], status, request.user.profile)
         messages.success(request, f'Application status updated to {status}!')
+    else:
+        messages.error(request, 'Unknown application status.')
     
     return redirect('job_applicants', job_id=application.job.id)
 
 
+@provider_required
+def bulk_update_application_status(request, job_id):
+    """Move the selected applicants of a job to one status in a single transaction"""
+    job = get_object_or_404(Job, pk=job_id, provider=request.user.profile)
+    if request.method != 'POST':
+        return redirect('job_applicants', job_id=job.id)
+    
+    status = request.POST.get('status')
+    application_ids = status_changes.parse_ids(request.POST.getlist('application_ids'))
+    if status not in status_changes.BULK_STATUSES:
+        messages.error(request, 'Please choose a status.')
+    elif not application_ids:
+        messages.error(request, 'Please select at least one applicant.')
+    else:
+        changed = status_changes.change_status(job, application_ids, status, request.user.profile)
+        messages.success(request, f'{changed} application(s) updated to {status}.')
+    
+    response = redirect('job_applicants', job_id=job.id)
+    if request.POST.get('status_filter'):
+        response['Location'] += '?' + urlencode({'status': request.POST['status_filter']})
+    return response
+
+
 @login_required
 def report_job(request, job_id):
     """Report a suspicious/fake job"""